@@ -0,0 +1,315 @@
+"""Офлайн-бенчмарки парсера на записанном корпусе страниц.
+
+Запись корпуса (нужен доступ в сеть):
+    python benchmarks/bench.py record
+Запуск бенчмарков без сети:
+    python benchmarks/bench.py run
+Замер времени запуска CLI:
+    python benchmarks/bench.py startup
+Сравнение двух запусков:
+    python benchmarks/bench.py compare <old.json> <new.json>
+"""
+import argparse
+from argparse import Namespace
+import datetime as dt
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urljoin
+
+import requests_cache
+import requests_mock
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+import main
+import utils
+from constants import DATETIME_FORMAT, MAIN_DOC_URL, PEP_URL
+from profiling import profiler
+
+CORPUS_DIR = BENCHMARKS_DIR / 'corpus'
+CORPUS_INDEX = 'index.json'
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+DEFAULT_REPEAT = 5
+MODES = ('whats-new', 'latest-versions', 'pep')
+
+
+def memory_session():
+    return requests_cache.CachedSession(backend='memory')
+
+
+def record_corpus(cli_args):
+    session = memory_session()
+    for mode in MODES:
+        main.MODE_TO_FUNCTION[mode](
+            session, Namespace(mode=mode, workers=cli_args.workers)
+        )
+    session.get(urljoin(MAIN_DOC_URL, 'download.html'))
+
+    CORPUS_DIR.mkdir(parents=True, exist_ok=True)
+    index = {}
+    for number, response in enumerate(session.cache.responses.values()):
+        file_name = f'{number:05}.html'
+        (CORPUS_DIR / file_name).write_bytes(response.content)
+        index[response.url] = {
+            'file': file_name,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() in ('content-type', 'etag', 'last-modified')
+            },
+        }
+    with open(CORPUS_DIR / CORPUS_INDEX, 'w', encoding='utf-8') as file:
+        json.dump(index, file, ensure_ascii=False, indent=2)
+    print(f'Записано страниц: {len(index)} в {CORPUS_DIR}')
+
+
+def load_corpus():
+    index_path = CORPUS_DIR / CORPUS_INDEX
+    if not index_path.exists():
+        sys.exit(
+            f'Корпус не найден: {index_path}. '
+            'Запишите его командой `python benchmarks/bench.py record`.'
+        )
+    with open(index_path, encoding='utf-8') as file:
+        index = json.load(file)
+    return {
+        url: (
+            (CORPUS_DIR / page['file']).read_bytes(),
+            page['headers'],
+        )
+        for url, page in index.items()
+    }
+
+
+def corpus_session(corpus):
+    adapter = requests_mock.Adapter()
+    for url, (content, headers) in corpus.items():
+        adapter.register_uri('GET', url, content=content, headers=headers)
+    session = memory_session()
+    session.mount('https://', adapter)
+    return session
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {
+        'runs': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+    }
+
+
+def run_mode(corpus, mode, workers, warm_session=None):
+    session = warm_session or corpus_session(corpus)
+    main.MODE_TO_FUNCTION[mode](
+        session, Namespace(mode=mode, workers=workers)
+    )
+
+
+def pep_pages(corpus):
+    return [
+        url for url in corpus
+        if url.startswith(PEP_URL + 'pep-')
+    ]
+
+
+def get_soup_all(session, urls):
+    for url in urls:
+        utils.get_soup(session, url)
+
+
+def extract_pep_status_all(soups):
+    for soup in soups:
+        utils.extract_pep_status(soup)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=BENCHMARKS_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmarks(cli_args):
+    corpus = load_corpus()
+    repeat = cli_args.repeat
+    workers = cli_args.workers
+    benchmarks = {}
+
+    for mode in MODES:
+        benchmarks[f'{mode} (cold)'] = timed(
+            lambda: run_mode(corpus, mode, workers), repeat
+        )
+        warm_session = corpus_session(corpus)
+        run_mode(corpus, mode, workers, warm_session)
+        benchmarks[f'{mode} (warm)'] = timed(
+            lambda: run_mode(corpus, mode, workers, warm_session), repeat
+        )
+
+    session = corpus_session(corpus)
+    urls = pep_pages(corpus)
+    get_soup_all(session, urls)
+    benchmarks['utils.get_soup'] = timed(
+        lambda: get_soup_all(session, urls), repeat
+    )
+    soups = [utils.get_soup(session, url) for url in urls]
+    benchmarks['utils.extract_pep_status'] = timed(
+        lambda: extract_pep_status_all(soups), repeat
+    )
+
+    profiler.enabled = True
+    for mode in MODES:
+        run_mode(corpus, mode, workers)
+    stages = profiler.summary()['stages']
+    profiler.enabled = False
+
+    report = {
+        'commit': current_commit(),
+        'created': dt.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'corpus_pages': len(corpus),
+        'pep_pages': len(urls),
+        'workers': workers,
+        'benchmarks': benchmarks,
+        'stages': stages,
+    }
+    save_report(report)
+
+
+def import_time(module):
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, cwd=SRC_DIR,
+    )
+    # Строки вида "import time: <self, us> | <cumulative, us> | <module>".
+    for line in completed.stderr.splitlines():
+        _, cumulative, name = (part.strip() for part in line.split('|'))
+        if name == module:
+            return int(cumulative) / 10 ** 6
+    return None
+
+
+def run_command(arguments):
+    subprocess.run(
+        [sys.executable, *arguments],
+        capture_output=True, check=True, cwd=SRC_DIR,
+    )
+
+
+def save_report(report, prefix=''):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
+    report_path = (
+        RESULTS_DIR / f'{prefix}{report["commit"]}_{now_formatted}.json'
+    )
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    for name, timings in report['benchmarks'].items():
+        print(f'{name:<28} median {timings["median"]:.4f} с')
+    print(f'Результаты сохранены: {report_path}')
+
+
+def run_startup_benchmarks(cli_args):
+    repeat = cli_args.repeat
+    benchmarks = {
+        'main.py --help': timed(
+            lambda: run_command(['main.py', '--help']), repeat
+        ),
+        'import main': timed(
+            lambda: run_command(['-c', 'import main']), repeat
+        ),
+    }
+    import_timings = [import_time('main') for _ in range(repeat)]
+    benchmarks['import main (importtime)'] = {
+        'runs': repeat,
+        'min': min(import_timings),
+        'median': statistics.median(import_timings),
+        'mean': statistics.mean(import_timings),
+    }
+    save_report({
+        'commit': current_commit(),
+        'created': dt.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'benchmarks': benchmarks,
+    }, prefix='startup_')
+
+
+def compare_reports(cli_args):
+    reports = []
+    for path in (cli_args.old, cli_args.new):
+        with open(path, encoding='utf-8') as file:
+            reports.append(json.load(file))
+    old, new = reports
+    print(f'{old["commit"]} -> {new["commit"]}')
+    for name, timings in new['benchmarks'].items():
+        if name not in old['benchmarks']:
+            continue
+        before = old['benchmarks'][name]['median']
+        after = timings['median']
+        change = (after - before) / before if before else 0
+        print(f'{name:<28} {before:.4f} -> {after:.4f} с ({change:+.1%})')
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(description='Бенчмарки парсера')
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=1,
+        help='Количество потоков для загрузки страниц',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('record', help='Запись корпуса страниц')
+    run = commands.add_parser('run', help='Запуск бенчмарков')
+    run.add_argument(
+        '-n',
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help='Количество повторов каждого замера',
+    )
+    startup = commands.add_parser(
+        'startup', help='Замер времени запуска CLI'
+    )
+    startup.add_argument(
+        '-n',
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help='Количество повторов каждого замера',
+    )
+    compare = commands.add_parser('compare', help='Сравнение двух запусков')
+    compare.add_argument('old', help='Файл результатов до изменений')
+    compare.add_argument('new', help='Файл результатов после изменений')
+    return parser
+
+
+COMMANDS = {
+    'record': record_corpus,
+    'run': run_benchmarks,
+    'startup': run_startup_benchmarks,
+    'compare': compare_reports,
+}
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.ERROR)
+    args = configure_argument_parser().parse_args()
+    COMMANDS[args.command](args)
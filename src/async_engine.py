@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from constants import (ASYNC_CACHE_NAME, BASE_DIR, CACHE_DIR,
+                       DEFAULT_WORKERS, NEVER_EXPIRE)
+from profiling import profiler
+from utils import extract_response
+
+
+def to_response(url, status, reason, headers, body, from_cache):
+    response = Response()
+    response.url = url
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.from_cache = from_cache
+    return response
+
+
+class AsyncEngine:
+    """Асинхронная загрузка страниц через aiohttp с постоянным кешем.
+
+    Цикл событий работает в отдельном потоке, поэтому движок можно
+    передавать в режимы парсера вместо сессии requests.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, expire_after=NEVER_EXPIRE,
+                 urls_expire_after=None):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, daemon=True,
+        )
+        self._thread.start()
+        self._parse_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._run(self._open(workers, expire_after, urls_expire_after or {}))
+
+    async def _open(self, workers, expire_after, urls_expire_after):
+        self._semaphore = asyncio.Semaphore(workers)
+        self.cache = SQLiteBackend(
+            cache_name=str(BASE_DIR / CACHE_DIR / ASYNC_CACHE_NAME),
+            expire_after=expire_after,
+            urls_expire_after=urls_expire_after,
+        )
+        self._session = CachedSession(cache=self.cache)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def get_response_async(self, url):
+        async with self._semaphore:
+            async with self._session.get(url) as response:
+                body = await response.read()
+                return to_response(
+                    str(response.url), response.status, response.reason,
+                    response.headers, body,
+                    getattr(response, 'from_cache', False),
+                )
+
+    async def get_extracted_async(self, url, extractor, result_cache=None,
+                                  parse_pool=None):
+        started = time.perf_counter()
+        response = await self.get_response_async(url)
+        profiler.record_response(
+            url, response, time.perf_counter() - started
+        )
+        response.encoding = 'utf-8'
+        response.raise_for_status()
+        return await self._loop.run_in_executor(
+            self._parse_pool,
+            extract_response,
+            url, response, extractor, result_cache, parse_pool,
+        )
+
+    def get(self, url):
+        """Загружает страницу синхронно.
+
+        Ответ учитывается в профиле вызывающим кодом (get_response).
+        """
+        return self._run(self.get_response_async(url)).result()
+
+    def map_extracted(self, urls, extractor, result_cache=None,
+                      parse_pool=None, on_error=None):
+        futures = [
+            (url, self._run(self.get_extracted_async(
+                url, extractor, result_cache, parse_pool
+            )))
+            for url in urls
+        ]
+        for url, future in futures:
+            try:
+                yield future.result()
+            except Exception as error:
+                if on_error is None:
+                    raise
+                on_error(url, error)
+                yield None
+
+    def clear_cache(self):
+        self._run(self.cache.clear()).result()
+
+    def close(self):
+        self._run(self._session.close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._parse_pool.shutdown()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from constants import (BASE_DIR, CACHE_DIR, RESULT_CACHE_FILE,
+                       RESULT_CACHE_MAX_ENTRIES)
+
+
+SQLITE_SIDECARS = ('-wal', '-shm', '-journal')
+
+
+def backend_path(cache):
+    """Возвращает файл или каталог хранилища кеша запросов.
+
+    Для хранилища в памяти возвращает None.
+    """
+    cache_dir = getattr(cache, 'cache_dir', None)
+    if cache_dir is not None:
+        return Path(cache_dir)
+    try:
+        return Path(cache.db_path)
+    except NotImplementedError:
+        return None
+
+
+def disk_usage(path):
+    """Размер файла или каталога на диске.
+
+    Для файла SQLite учитываются его журналы.
+    """
+    if path is None:
+        return 0
+    if path.is_dir():
+        files = path.rglob('*')
+    else:
+        files = (path, *(
+            path.with_name(path.name + suffix) for suffix in SQLITE_SIDECARS
+        ))
+    return sum(file.stat().st_size for file in files if file.is_file())
+
+
+def response_fingerprint(response):
+    etag = response.headers.get('ETag')
+    if etag:
+        return f'etag:{etag}'
+    return 'sha1:' + hashlib.sha1(response.content).hexdigest()
+
+
+def as_tuples(value):
+    if isinstance(value, list):
+        return tuple(as_tuples(item) for item in value)
+    return value
+
+
+class ResultCache:
+    """Кеш результатов разбора страниц по отпечатку ответа."""
+
+    def __init__(self, path, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None,
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'url TEXT, extractor TEXT, fingerprint TEXT, value TEXT, '
+            'last_used REAL, PRIMARY KEY (url, extractor))'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS results_last_used '
+            'ON results (last_used)'
+        )
+
+    def get(self, url, extractor, fingerprint):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM results '
+                'WHERE url = ? AND extractor = ? AND fingerprint = ?',
+                (url, extractor, fingerprint),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                'UPDATE results SET last_used = ? '
+                'WHERE url = ? AND extractor = ?',
+                (time.time(), url, extractor),
+            )
+        return as_tuples(json.loads(row[0]))
+
+    def set(self, url, extractor, fingerprint, value):
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                (url, extractor, fingerprint, json.dumps(value), time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        self._connection.execute(
+            'DELETE FROM results WHERE rowid IN ('
+            'SELECT rowid FROM results ORDER BY last_used DESC '
+            'LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute('DELETE FROM results')
+
+
+@lru_cache(maxsize=None)
+def open_result_cache(path):
+    return ResultCache(path)
+
+
+def get_result_cache(cli_args):
+    if not getattr(cli_args, 'result_cache', False):
+        return None
+    return open_result_cache(BASE_DIR / CACHE_DIR / RESULT_CACHE_FILE)
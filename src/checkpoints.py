@@ -0,0 +1,91 @@
+from collections import Counter
+import json
+import logging
+import os
+
+from constants import (BASE_DIR, CACHE_DIR, CHECKPOINT_INTERVAL,
+                       FETCH_RETRY_ROUNDS, PEP_CHECKPOINT_FILE)
+
+
+class PepCheckpoint:
+    """Контрольная точка обхода страниц PEP."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path.exists():
+            return {}
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)['statuses']
+
+    def save(self, statuses):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'statuses': statuses,
+                    'sum_status': Counter(statuses.values()),
+                },
+                file, ensure_ascii=False,
+            )
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def open_pep_checkpoint():
+    return PepCheckpoint(BASE_DIR / CACHE_DIR / PEP_CHECKPOINT_FILE)
+
+
+def fetch_round(checkpoint, pending, fetch_statuses, statuses, interval):
+    from tqdm import tqdm
+
+    for count, (status, link) in enumerate(zip(
+        tqdm(fetch_statuses(pending), total=len(pending)), pending
+    ), start=1):
+        if status is not None:
+            statuses[link] = status
+        if checkpoint and count % interval == 0:
+            checkpoint.save(statuses)
+    if checkpoint:
+        checkpoint.save(statuses)
+
+
+def crawl_pep_statuses(checkpoint, links, fetch_statuses, resume=False,
+                       interval=CHECKPOINT_INTERVAL,
+                       retry_rounds=FETCH_RETRY_ROUNDS):
+    """Загружает статусы PEP, сохраняя прогресс в контрольную точку.
+
+    Страницы с ошибками загружаются повторно после основного прохода.
+    Без контрольной точки прогресс хранится только в памяти.
+    Возвращает статусы в порядке ссылок, None — для PEP, которые
+    так и не удалось загрузить.
+    """
+    statuses = checkpoint.load() if checkpoint and resume else {}
+    if statuses:
+        logging.info(
+            f'Продолжение обхода PEP: загружено {len(statuses)} '
+            f'из {len(links)}'
+        )
+    pending = [link for link in links if link not in statuses]
+    for retry_round in range(retry_rounds + 1):
+        if not pending:
+            break
+        if retry_round:
+            logging.info(f'Повторная загрузка PEP с ошибками: {len(pending)}')
+        fetch_round(checkpoint, pending, fetch_statuses, statuses, interval)
+        pending = [link for link in pending if link not in statuses]
+
+    if pending:
+        logging.error(
+            f'Не удалось загрузить PEP: {len(pending)}. Запустите парсер '
+            'с флагом --resume, чтобы загрузить только их:\n'
+            + '\n'.join(pending)
+        )
+    elif checkpoint:
+        checkpoint.clear()
+    return [statuses.get(link) for link in links]
@@ -1,9 +1,60 @@
 import argparse
 import logging
 from logging.handlers import RotatingFileHandler
+import zlib
 
-from constants import (BASE_DIR, FILE_OUTPUT, LOGS_DIR,
-                       LOG_FORMAT, PRETTY_OUTPUT, READABLE_DATETIME_FORMAT)
+from constants import (API_SOURCE, ASYNC_ENGINE, ASYNC_ENGINE_MODES,
+                       AUTO_SOURCE, BASE_DIR, BS4_PARSER, CACHE_DIR,
+                       DEFAULT_PARSER, DEFAULT_RATE_LIMIT, DEFAULT_RETRIES,
+                       DEFAULT_WORKERS, FILESYSTEM_BACKEND, FILE_OUTPUT,
+                       HISTORY_MODES, HTML_SOURCE, HTTP_CACHE_NAME,
+                       JSONL_OUTPUT, JSON_SERIALIZER, LOGS_DIR, LOG_FORMAT,
+                       LXML_PARSER, MEMORY_BACKEND, NEVER_EXPIRE,
+                       PARQUET_OUTPUT, PICKLE_SERIALIZER, POOL_CONNECTIONS,
+                       PRETTY_OUTPUT, READABLE_DATETIME_FORMAT,
+                       RETRY_BACKOFF_FACTOR, RETRY_METHODS, RETRY_STATUSES,
+                       SQLITE_BACKEND, THREADS_ENGINE)
+
+BACKEND_OPTIONS = {
+    SQLITE_BACKEND: {'wal': True},
+}
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается целое число больше нуля, получено: {value}'
+        )
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается неотрицательное целое число, получено: {value}'
+        )
+    return number
+
+
+def non_negative_float(value):
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается неотрицательное число, получено: {value}'
+        )
+    return number
+
+
+def url_expiration(value):
+    pattern, separator, seconds = value.rpartition('=')
+    if not separator or not pattern:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается значение вида <шаблон URL>=<секунды>, '
+            f'получено: {value}'
+        )
+    return pattern, int(seconds)
 
 
 def configure_argument_parser(available_modes):
@@ -11,6 +62,7 @@ def configure_argument_parser(available_modes):
 
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера',
     )
@@ -20,12 +72,185 @@ def configure_argument_parser(available_modes):
         action='store_true',
         help='Очистка кеша',
     )
+    parser.add_argument(
+        '--cache-backend',
+        choices=(SQLITE_BACKEND, FILESYSTEM_BACKEND, MEMORY_BACKEND),
+        default=SQLITE_BACKEND,
+        help='Хранилище кеша запросов',
+    )
+    parser.add_argument(
+        '--cache-serializer',
+        choices=(PICKLE_SERIALIZER, JSON_SERIALIZER),
+        default=PICKLE_SERIALIZER,
+        help='Формат хранения ответов в кеше запросов',
+    )
+    parser.add_argument(
+        '--cache-compress',
+        action='store_true',
+        help='Сжатие ответов в кеше запросов',
+    )
+    parser.add_argument(
+        '--older-than',
+        type=positive_int,
+        metavar='DAYS',
+        help='Удаление из кеша ответов старше указанного числа дней',
+    )
+    parser.add_argument(
+        '--no-result-cache',
+        dest='result_cache',
+        action='store_false',
+        help='Отключение кеша результатов разбора страниц',
+    )
+    parser.add_argument(
+        '-r',
+        '--revalidate',
+        action='store_true',
+        help='Проверка закешированных страниц условными запросами',
+    )
+    parser.add_argument(
+        '--expire-after',
+        type=int,
+        default=NEVER_EXPIRE,
+        help='Время жизни кеша в секундах',
+    )
+    parser.add_argument(
+        '--expire-url',
+        type=url_expiration,
+        action='append',
+        default=[],
+        metavar='PATTERN=SECONDS',
+        help='Время жизни кеша в секундах для URL по шаблону',
+    )
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY_OUTPUT, FILE_OUTPUT),
+        choices=(
+            PRETTY_OUTPUT, FILE_OUTPUT, JSONL_OUTPUT, PARQUET_OUTPUT,
+        ),
         help='Дополнительные способы вывода данных',
     )
+    parser.add_argument(
+        '-s',
+        '--stream',
+        action='store_true',
+        help='Потоковый вывод строк результата по мере готовности',
+    )
+    parser.add_argument(
+        '--parse-processes',
+        type=non_negative_int,
+        default=0,
+        metavar='N',
+        help='Количество процессов для разбора страниц (0 - без пула)',
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=(THREADS_ENGINE, ASYNC_ENGINE),
+        default=THREADS_ENGINE,
+        help='Движок загрузки страниц',
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество потоков для параллельной загрузки страниц',
+    )
+
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Загрузка только новых и изменившихся PEP',
+    )
+    parser.add_argument(
+        '--retries',
+        type=non_negative_int,
+        default=DEFAULT_RETRIES,
+        help='Количество повторных запросов при ошибках сервера',
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=non_negative_float,
+        default=DEFAULT_RATE_LIMIT,
+        metavar='RPS',
+        help='Наибольшее число запросов в секунду к одному сайту, '
+             '0 — без ограничения частоты',
+    )
+    parser.add_argument(
+        '--max-in-flight',
+        type=positive_int,
+        metavar='N',
+        help='Наибольшее число одновременных запросов к одному сайту '
+             '(по умолчанию равно количеству потоков)',
+    )
+    parser.add_argument(
+        '--no-throttle',
+        dest='throttle',
+        action='store_false',
+        help='Отключение ограничения запросов к сайтам',
+    )
+    parser.add_argument(
+        '-p',
+        '--parser',
+        choices=(LXML_PARSER, BS4_PARSER),
+        default=DEFAULT_PARSER,
+        help='Способ разбора страниц PEP',
+    )
+
+    parser.add_argument(
+        '--replay',
+        metavar='CORPUS',
+        help='Воспроизведение запуска по архиву страниц без обращения '
+             'к сети и кешу запросов',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продолжение обхода страниц PEP с контрольной точки',
+    )
+    parser.add_argument(
+        '--no-checkpoint',
+        dest='checkpoint',
+        action='store_false',
+        help='Отключение контрольных точек обхода страниц PEP',
+    )
+    parser.add_argument(
+        '--pep-source',
+        choices=(AUTO_SOURCE, API_SOURCE, HTML_SOURCE),
+        default=AUTO_SOURCE,
+        help='Источник статусов PEP: API с откатом на страницы PEP, '
+             'только API или только страницы PEP',
+    )
+    parser.add_argument(
+        '--verify-sample',
+        type=non_negative_int,
+        default=0,
+        metavar='N',
+        help='Сверка статусов из API со страницами N случайных PEP',
+    )
+    parser.add_argument(
+        '--history',
+        action='store_true',
+        help='Сохранение результатов запуска в историю',
+    )
+    parser.add_argument(
+        '--history-of',
+        choices=HISTORY_MODES,
+        default='pep',
+        help='Режим, историю результатов которого выводят режимы '
+             'history и history-diff',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Вывод сводки по времени загрузки и разбора страниц',
+    )
+    parser.add_argument(
+        '--profile-json',
+        metavar='PATH',
+        help='Сохранение сводки по времени загрузки и разбора в JSON',
+    )
 
     return parser
 
@@ -45,3 +270,120 @@ def configure_logging():
         level=logging.INFO,
         handlers=(rotating_handler, logging.StreamHandler()),
     )
+
+
+def configure_http_adapter(workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                           rate_limit=None, max_in_flight=None):
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    pool_options = {
+        'pool_connections': POOL_CONNECTIONS,
+        'pool_maxsize': workers,
+    }
+    if rate_limit is not None:
+        from throttling import RateLimiter, ThrottledAdapter
+
+        return ThrottledAdapter(
+            RateLimiter(rate_limit or None, max_in_flight or workers),
+            retries=retries,
+            max_retries=Retry(
+                total=retries, backoff_factor=RETRY_BACKOFF_FACTOR,
+                allowed_methods=RETRY_METHODS,
+            ),
+            **pool_options,
+        )
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return HTTPAdapter(max_retries=retry, **pool_options)
+
+
+def configure_serializer(name, compress=False):
+    from requests_cache.serializers import (SERIALIZERS, SerializerPipeline,
+                                            Stage, utf8_encoder)
+
+    serializer = SERIALIZERS[name]
+    if not compress:
+        return serializer
+    stages = list(serializer.stages)
+    if not serializer.is_binary:
+        stages.append(utf8_encoder)
+    stages.append(Stage(zlib, dumps='compress', loads='decompress'))
+    return SerializerPipeline(stages, name=f'{name}-zlib', is_binary=True)
+
+
+def configure_cache_backend(cli_args):
+    from requests_cache.backends import init_backend
+
+    return init_backend(
+        BASE_DIR / CACHE_DIR / HTTP_CACHE_NAME,
+        cli_args.cache_backend,
+        serializer=configure_serializer(
+            cli_args.cache_serializer, cli_args.cache_compress
+        ),
+        **BACKEND_OPTIONS.get(cli_args.cache_backend, {}),
+    )
+
+
+def configure_async_engine(cli_args):
+    try:
+        from async_engine import AsyncEngine
+    except ImportError as error:
+        raise ImportError(
+            'Для асинхронного движка установите aiohttp-client-cache '
+            'и aiosqlite: pip install aiohttp-client-cache aiosqlite'
+        ) from error
+    engine = AsyncEngine(
+        workers=cli_args.workers,
+        expire_after=cli_args.expire_after,
+        urls_expire_after=dict(cli_args.expire_url),
+    )
+    if cli_args.clear_cache:
+        engine.clear_cache()
+    return engine
+
+
+def configure_replay_session(path):
+    import requests
+
+    from corpus import Corpus, ReplayAdapter
+
+    session = requests.Session()
+    adapter = ReplayAdapter(Corpus(path))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def configure_session(cli_args):
+    if getattr(cli_args, 'replay', None) is not None:
+        return configure_replay_session(cli_args.replay)
+    if (getattr(cli_args, 'engine', THREADS_ENGINE) == ASYNC_ENGINE
+            and set(cli_args.mode) <= set(ASYNC_ENGINE_MODES)):
+        return configure_async_engine(cli_args)
+
+    import requests_cache
+
+    session = requests_cache.CachedSession(
+        backend=configure_cache_backend(cli_args),
+        expire_after=cli_args.expire_after,
+        urls_expire_after=dict(cli_args.expire_url),
+        always_revalidate=cli_args.revalidate,
+        stale_if_error=True,
+    )
+    adapter = configure_http_adapter(
+        cli_args.workers, cli_args.retries,
+        rate_limit=cli_args.rate_limit if cli_args.throttle else None,
+        max_in_flight=cli_args.max_in_flight,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if cli_args.clear_cache:
+        session.cache.clear()
+    return session
@@ -2,13 +2,16 @@ from pathlib import Path
 
 # Пути к директориям
 BASE_DIR = Path(__file__).parent
+CACHE_DIR = 'cache'
 DOWNLOADS_DIR = 'downloads'
 LOGS_DIR = 'logs'
 RESULTS_DIR = 'results'
+CORPUS_DIR = 'corpus'
 
 # URL-адреса
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://peps.python.org/'
+PEP_API_URL = 'https://peps.python.org/api/peps.json'
 WHATS_NEW_URL = 'https://docs.python.org/3/whatsnew/'
 
 # Форматы даты и времени
@@ -21,6 +24,94 @@ LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 # Типы вывода
 PRETTY_OUTPUT = 'pretty'
 FILE_OUTPUT = 'file'
+JSONL_OUTPUT = 'jsonl'
+PARQUET_OUTPUT = 'parquet'
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_BATCH_ROWS = 1000
+
+# Время жизни кеша: по умолчанию страницы не устаревают
+NEVER_EXPIRE = -1
+
+# Кеш запросов
+HTTP_CACHE_NAME = 'http_cache'
+SQLITE_BACKEND = 'sqlite'
+FILESYSTEM_BACKEND = 'filesystem'
+MEMORY_BACKEND = 'memory'
+PICKLE_SERIALIZER = 'pickle'
+JSON_SERIALIZER = 'json'
+
+# Запуск нескольких режимов за раз
+ALL_MODES = 'all'
+BULK_MODES = ('whats-new', 'latest-versions', 'download', 'pep')
+
+# Движки загрузки страниц
+THREADS_ENGINE = 'threads'
+ASYNC_ENGINE = 'async'
+ASYNC_CACHE_NAME = 'aiohttp_cache'
+ASYNC_ENGINE_MODES = ('whats-new', 'latest-versions', 'pep', 'pep-metadata')
+
+# Кеш результатов разбора страниц
+RESULT_CACHE_FILE = 'results.sqlite'
+RESULT_CACHE_MAX_ENTRIES = 5000
+
+# Размер части файла при потоковой загрузке, байт
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Снимок статусов PEP для инкрементального обновления
+PEP_SNAPSHOT_FILE = 'peps.sqlite'
+
+# Контрольная точка обхода страниц PEP
+PEP_CHECKPOINT_FILE = 'pep_checkpoint.json'
+CHECKPOINT_INTERVAL = 50
+FETCH_RETRY_ROUNDS = 2
+
+# История результатов запусков
+HISTORY_DIR = 'history'
+HISTORY_FILE = 'history.sqlite'
+HISTORY_MODES = ('whats-new', 'latest-versions', 'pep')
+
+# Архив страниц для воспроизведения без сети
+CORPUS_MAGIC = b'PEPCORP1'
+CORPUS_HEADERS = ('content-type', 'etag', 'last-modified')
+
+# Количество потоков для параллельной загрузки страниц
+DEFAULT_WORKERS = 8
+
+# Типы разбираемых страниц
+PEP_INDEX_PAGE = 'pep-index'
+PEP_PAGE = 'pep'
+WHATS_NEW_INDEX_PAGE = 'whats-new-index'
+WHATS_NEW_PAGE = 'whats-new'
+DOCS_SIDEBAR_PAGE = 'docs-sidebar'
+DOWNLOAD_PAGE = 'download'
+
+# Способы разбора страниц PEP
+LXML_PARSER = 'lxml'
+BS4_PARSER = 'bs4'
+DEFAULT_PARSER = LXML_PARSER
+
+# Источники статусов PEP
+AUTO_SOURCE = 'auto'
+API_SOURCE = 'api'
+HTML_SOURCE = 'html'
+
+# Поля заголовка страницы PEP
+PEP_HEADER_FIELDS = (
+    'Author', 'Sponsor', 'BDFL-Delegate', 'PEP-Delegate', 'Discussions-To',
+    'Status', 'Type', 'Topic', 'Requires', 'Created', 'Python-Version',
+    'Post-History', 'Replaces', 'Superseded-By', 'Resolution',
+)
+
+# Пул соединений и повторные запросы
+POOL_CONNECTIONS = 10
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ('GET', 'HEAD')
+
+# Ограничение запросов к одному сайту
+DEFAULT_RATE_LIMIT = 10
+LATENCY_TOLERANCE = 2
 
 # Ожидаемые статусы PEP
 EXPECTED_STATUS = {
@@ -0,0 +1,114 @@
+import json
+import mmap
+import struct
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from constants import CORPUS_HEADERS, CORPUS_MAGIC
+
+INDEX_OFFSET = struct.Struct('<Q')
+
+
+def iter_cached_pages(cache):
+    """Возвращает успешные GET-ответы из кеша запросов.
+
+    Каждая страница возвращается как (адреса, заголовки, тело),
+    где адреса — итоговый и запрошенный URL. Записи, которые
+    не удалось прочитать, пропускаются.
+    """
+    for response in cache.responses.values():
+        if (response is None or response.status_code != 200
+                or response.request.method != 'GET'):
+            continue
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() in CORPUS_HEADERS
+        }
+        urls = dict.fromkeys((response.url, response.request.url))
+        yield tuple(urls), headers, response.content
+
+
+def write_corpus(path, pages):
+    """Записывает страницы в один файл с индексом в конце.
+
+    Формат: сигнатура, тела страниц подряд, индекс в JSON
+    и смещение индекса. Возвращает количество записанных страниц.
+    """
+    index = {}
+    count = 0
+    with open(path, 'wb') as file:
+        file.write(CORPUS_MAGIC)
+        for urls, headers, content in pages:
+            page = (file.tell(), len(content), headers)
+            file.write(content)
+            index.update(dict.fromkeys(urls, page))
+            count += 1
+        index_offset = file.tell()
+        file.write(json.dumps(index, ensure_ascii=False).encode('utf-8'))
+        file.write(INDEX_OFFSET.pack(index_offset))
+    return count
+
+
+class Corpus:
+    """Архив страниц, отображённый в память.
+
+    Тела страниц читаются срезами отображения без чтения файла
+    в промежуточные буферы.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(CORPUS_MAGIC)] != CORPUS_MAGIC:
+            self.close()
+            raise ValueError(f'Файл {path} не является архивом страниц')
+        index_end = len(self._map) - INDEX_OFFSET.size
+        index_offset, = INDEX_OFFSET.unpack_from(self._map, index_end)
+        self.index = json.loads(self._map[index_offset:index_end])
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, url):
+        if url not in self.index:
+            return None
+        offset, length, headers = self.index[url]
+        return self._map[offset:offset + length], headers
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Транспорт, отдающий ответы из архива страниц без обращения к сети.
+
+    Адреса, которых нет в архиве, возвращаются с кодом 404.
+    """
+
+    def __init__(self, corpus):
+        super().__init__()
+        self.corpus = corpus
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.url = request.url
+        response.request = request
+        page = self.corpus.get(request.url)
+        if page is None:
+            response.status_code = 404
+            response.reason = 'Not Found In Corpus'
+            content, headers = b'', {}
+        else:
+            response.status_code = 200
+            response.reason = 'OK'
+            content, headers = page
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = b'' if request.method == 'HEAD' else content
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        self.corpus.close()
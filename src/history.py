@@ -0,0 +1,184 @@
+import datetime as dt
+from functools import lru_cache
+import json
+import sqlite3
+import threading
+
+from constants import BASE_DIR, DATETIME_FORMAT, HISTORY_DIR, HISTORY_FILE
+
+
+def order_rows(rows, positions):
+    """Упорядочивает пары (номер, значение) строк как в запуске."""
+    return sorted(rows, key=lambda row: positions[row[0]])
+
+
+class ResultHistory:
+    """История результатов запусков парсера.
+
+    Строка результата хранится один раз вместе с первым и последним
+    запуском, в котором она встречалась, поэтому неизменившиеся строки
+    не занимают места при новых запусках. Для каждого запуска хранится
+    только порядок его строк в виде списка их номеров.
+    """
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                'id INTEGER PRIMARY KEY, mode TEXT, started TEXT, '
+                'header TEXT, row_ids TEXT)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS rows ('
+                'id INTEGER PRIMARY KEY, mode TEXT, value TEXT, '
+                'first_run INTEGER, last_run INTEGER)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS runs_mode ON runs (mode, id)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS rows_first_run '
+                'ON rows (mode, first_run)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS rows_last_run '
+                'ON rows (mode, last_run)'
+            )
+
+    def append(self, mode, results):
+        header, *rows = results
+        values = dict.fromkeys(
+            json.dumps(list(row), ensure_ascii=False) for row in rows
+        )
+        started = dt.datetime.now().strftime(DATETIME_FORMAT)
+        with self._lock, self._connection:
+            previous_run = self._last_runs(mode, 1)
+            run_id = self._connection.execute(
+                'INSERT INTO runs (mode, started, header) VALUES (?, ?, ?)',
+                (mode, started, json.dumps(header, ensure_ascii=False)),
+            ).lastrowid
+            current = dict(self._connection.execute(
+                'SELECT value, id FROM rows '
+                'WHERE mode = ? AND last_run IS NULL',
+                (mode,),
+            ))
+            self._connection.executemany(
+                'UPDATE rows SET last_run = ? WHERE id = ?',
+                [
+                    (previous_run[0], row_id)
+                    for value, row_id in current.items()
+                    if value not in values
+                ],
+            )
+            for value in values:
+                if value not in current:
+                    current[value] = self._connection.execute(
+                        'INSERT INTO rows (mode, value, first_run) '
+                        'VALUES (?, ?, ?)',
+                        (mode, value, run_id),
+                    ).lastrowid
+            self._connection.execute(
+                'UPDATE runs SET row_ids = ? WHERE id = ?',
+                (json.dumps([current[value] for value in values]), run_id),
+            )
+        return run_id
+
+    def _positions(self, run_ids):
+        """Возвращает позиции строк в каждом из запусков."""
+        positions = {}
+        for run_id, row_ids in self._connection.execute(
+            'SELECT id, row_ids FROM runs WHERE id IN '
+            f'({", ".join("?" * len(run_ids))})',
+            run_ids,
+        ):
+            positions[run_id] = {
+                row_id: position
+                for position, row_id in enumerate(json.loads(row_ids))
+            }
+        return positions
+
+    def _last_runs(self, mode, count):
+        return [
+            run_id for run_id, in self._connection.execute(
+                'SELECT id FROM runs WHERE mode = ? '
+                'ORDER BY id DESC LIMIT ?',
+                (mode, count),
+            )
+        ]
+
+    def _header(self, run_id):
+        header, = self._connection.execute(
+            'SELECT header FROM runs WHERE id = ?', (run_id,)
+        ).fetchone()
+        return tuple(json.loads(header))
+
+    def timeline(self, mode):
+        """Строки результата каждого запуска режима."""
+        with self._lock:
+            last_runs = self._last_runs(mode, 1)
+            if not last_runs:
+                return []
+            runs = {}
+            for run_id, started, row_id, value in self._connection.execute(
+                'SELECT runs.id, runs.started, rows.id, rows.value FROM runs '
+                'JOIN rows ON rows.mode = runs.mode '
+                'AND rows.first_run <= runs.id '
+                'AND (rows.last_run IS NULL OR rows.last_run >= runs.id) '
+                'WHERE runs.mode = ? ORDER BY runs.id, rows.id',
+                (mode,),
+            ):
+                runs.setdefault((run_id, started), []).append((row_id, value))
+            positions = self._positions([run_id for run_id, _ in runs])
+            header = self._header(last_runs[0])
+        return [('Запуск', *header)] + [
+            (started, *json.loads(value))
+            for (run_id, started), rows in runs.items()
+            for _, value in order_rows(rows, positions.get(run_id, {}))
+        ]
+
+    def changes(self, mode):
+        """Строки, появившиеся и пропавшие с предыдущего запуска режима."""
+        with self._lock:
+            last_runs = self._last_runs(mode, 2)
+            if not last_runs:
+                return []
+            last_run = last_runs[0]
+            previous_run = last_runs[1] if len(last_runs) > 1 else None
+            positions = self._positions(last_runs)
+            added = order_rows(self._connection.execute(
+                'SELECT id, value FROM rows WHERE mode = ? AND first_run = ?',
+                (mode, last_run),
+            ).fetchall(), positions.get(last_run, {}))
+            removed = order_rows(self._connection.execute(
+                'SELECT id, value FROM rows WHERE mode = ? AND last_run = ?',
+                (mode, previous_run),
+            ).fetchall(), positions.get(previous_run, {}))
+            header = self._header(last_run)
+        return [('Изменение', *header)] + [
+            (sign, *json.loads(value))
+            for sign, rows in (('+', added), ('-', removed))
+            for _, value in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def open_result_history(path):
+    return ResultHistory(path)
+
+
+def get_result_history():
+    return open_result_history(BASE_DIR / HISTORY_DIR / HISTORY_FILE)
+
+
+def record_history(mode, results):
+    """Передаёт строки результата дальше и сохраняет их в историю."""
+    rows = []
+    for row in results:
+        rows.append(row)
+        yield row
+    if rows:
+        get_result_history().append(mode, rows)
@@ -1,58 +1,71 @@
+from argparse import Namespace
 from collections import defaultdict
+import datetime as dt
+from functools import partial
 import logging
-import re
+import threading
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
-from constants import (BASE_DIR, DOWNLOADS_DIR, EXPECTED_STATUS,
-                       MAIN_DOC_URL, PEP_URL, WHATS_NEW_URL)
+from caches import backend_path, disk_usage, get_result_cache
+from checkpoints import crawl_pep_statuses, open_pep_checkpoint
+from configs import (configure_argument_parser, configure_logging,
+                     configure_session)
+from constants import (ALL_MODES, API_SOURCE, AUTO_SOURCE, BASE_DIR,
+                       BS4_PARSER, BULK_MODES, CORPUS_DIR, DATETIME_FORMAT,
+                       DEFAULT_PARSER, DEFAULT_WORKERS, DOCS_SIDEBAR_PAGE,
+                       DOWNLOADS_DIR, DOWNLOAD_PAGE, EXPECTED_STATUS,
+                       HISTORY_MODES, HTML_SOURCE, LXML_PARSER, MAIN_DOC_URL,
+                       PEP_HEADER_FIELDS, WHATS_NEW_URL)
+from history import get_result_history, record_history
 from outputs import control_output
-from utils import (extract_pep_link, extract_pep_status,
-                   find_tag, get_soup)
-
-
-def whats_new(session):
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, Автор')]
-
-    soup = get_soup(session, WHATS_NEW_URL)
-    main_div = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
-    div_with_ul = find_tag(main_div, 'div', attrs={'class': 'toctree-wrapper'})
-    sections_by_python = div_with_ul.find_all('li',
-                                              attrs={'class': 'toctree-l1'})
-
-    for section in sections_by_python:
-        version_a_tag = section.find('a')
-        version_link = urljoin(WHATS_NEW_URL, version_a_tag['href'])
-        soup = get_soup(session, version_link)
-        h1 = find_tag(soup, 'h1')
-        dl = find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
-        results.append((version_link, h1.text, dl_text))
-
-    return results
-
-
-def latest_versions(session):
-    soup = get_soup(session, MAIN_DOC_URL)
-
-    sidebar = find_tag(soup, 'div', attrs={'class': 'sphinxsidebarwrapper'})
-    ul_tags = sidebar.find_all('ul')
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all('a')
+from pep_api import api_pep_statuses
+from profiling import profiler
+from rules import PYTHON_VERSION_PATTERN, select
+from snapshots import open_pep_snapshot, sync_pep_statuses
+from utils import (collect_rows, download_file, extract_pep_header,
+                   extract_pep_header_xpath, extract_pep_status,
+                   extract_pep_status_xpath, extract_whats_new_entry,
+                   extract_whats_new_links, fetch_extracted, get_extracted,
+                   get_parse_pool, get_pep_rows, get_soup, log_fetch_error,
+                   map_concurrently)
+
+
+def iter_whats_new(session, cli_args=None):
+    yield 'Ссылка на статью', 'Заголовок', 'Редактор, Автор'
+    workers = getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    result_cache = get_result_cache(cli_args)
+
+    version_links = get_extracted(
+        session, WHATS_NEW_URL, extract_whats_new_links, result_cache,
+    )
+    entries = fetch_extracted(
+        session, version_links, extract_whats_new_entry, result_cache,
+        workers, get_parse_pool(cli_args),
+    )
+    for version_link, (h1_text, dl_text) in zip(version_links, entries):
+        yield version_link, h1_text, dl_text
+
+
+def whats_new(session, cli_args=None):
+    return collect_rows(iter_whats_new(session, cli_args), cli_args)
+
+
+def iter_latest_versions(session, cli_args=None):
+    soup = get_soup(session, MAIN_DOC_URL, parse_only=DOCS_SIDEBAR_PAGE)
+
+    sidebar = select(soup, DOCS_SIDEBAR_PAGE).require('sidebar')
+    for ul in sidebar.get('lists', []):
+        if 'All versions' in ul.element.text:
+            a_tags = ul.get('links', [])
             break
     else:
         raise ValueError('Ничего не нашлось.')
 
-    results = [('Ссылка на документацию', 'Версия', 'Статус')]
-    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+    yield 'Ссылка на документацию', 'Версия', 'Статус'
     for a_tag in a_tags:
         link = a_tag['href']
 
-        match = re.match(pattern, a_tag.text)
+        match = PYTHON_VERSION_PATTERN.match(a_tag.text)
         if match:
             version = match.group('version')
             status = match.group('status')
@@ -60,21 +73,19 @@ def latest_versions(session):
             version = a_tag.text.strip()
             status = ''
 
-        results.append((link, version, status))
+        yield link, version, status
 
-    return results
 
+def latest_versions(session, cli_args=None):
+    return collect_rows(iter_latest_versions(session, cli_args), cli_args)
 
-def download(session):
-    downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
 
-    soup = get_soup(session, downloads_url)
+def download(session, cli_args=None):
+    downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
 
-    pdf_a4_tag = find_tag(soup, 'a',
-                          attrs={'href': re.compile(r'.+pdf-a4\.zip$')})
+    soup = get_soup(session, downloads_url, parse_only=DOWNLOAD_PAGE)
 
-    if not pdf_a4_tag:
-        raise ValueError("Не удалось найти ссылку на архив pdf-a4.zip")
+    pdf_a4_tag = select(soup, DOWNLOAD_PAGE).require('archive')
 
     pdf_a4_link = urljoin(downloads_url, pdf_a4_tag['href'])
 
@@ -84,84 +95,296 @@ def download(session):
     filename = pdf_a4_link.split('/')[-1]
     archive_path = downloads_dir / filename
 
-    response = session.get(pdf_a4_link)
-
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-
-    logging.info(f'Архив успешно загружен и сохранен по пути: {archive_path}')
-
-
-def pep(session):
-    results = [('Статус', 'Количество')]
+    if download_file(session, pdf_a4_link, archive_path):
+        logging.info(
+            f'Архив успешно загружен и сохранен по пути: {archive_path}'
+        )
+
+
+def get_pep_source(cli_args=None):
+    """Возвращает источник статусов PEP.
+
+    Флаги -i/--incremental и --resume работают только со страницами
+    PEP, поэтому в режиме auto они выбирают загрузку со страниц.
+    """
+    pep_source = getattr(cli_args, 'pep_source', HTML_SOURCE)
+    html_flags = [
+        flag for flag, name in (
+            ('-i/--incremental', 'incremental'), ('--resume', 'resume')
+        )
+        if getattr(cli_args, name, False)
+    ]
+    if not html_flags or pep_source == HTML_SOURCE:
+        return pep_source
+    if pep_source == AUTO_SOURCE:
+        return HTML_SOURCE
+    logging.warning(
+        f'Флаги {", ".join(html_flags)} игнорируются: статусы PEP '
+        'загружаются из API'
+    )
+    return pep_source
+
+
+def get_pep_statuses(session, pep_rows, fetch_statuses, result_cache,
+                     cli_args=None):
+    """Возвращает полные статусы PEP в порядке строк индекса.
+
+    В режиме auto статусы берутся из API одним запросом,
+    а при его недоступности загружаются со страниц PEP.
+    """
+    pep_source = get_pep_source(cli_args)
+    if pep_source != HTML_SOURCE:
+        try:
+            return api_pep_statuses(
+                session, pep_rows, fetch_statuses, result_cache,
+                getattr(cli_args, 'verify_sample', 0),
+            )
+        except Exception as error:
+            if pep_source == API_SOURCE:
+                raise
+            logging.warning(
+                f'Не удалось получить статусы PEP из API: {error}. '
+                'Статусы загружаются со страниц PEP'
+            )
+    if getattr(cli_args, 'incremental', False):
+        return sync_pep_statuses(
+            open_pep_snapshot(), pep_rows, fetch_statuses
+        )
+    return crawl_pep_statuses(
+        open_pep_checkpoint() if getattr(cli_args, 'checkpoint', False)
+        else None,
+        [row.url for row in pep_rows],
+        fetch_statuses,
+        resume=getattr(cli_args, 'resume', False),
+    )
+
+
+def iter_pep(session, cli_args=None):
+    yield 'Статус', 'Количество'
     sum_status = defaultdict(int)
-
-    soup = get_soup(session, PEP_URL)
-
-    section_tag = find_tag(soup, 'section', attrs={'id': 'numerical-index'})
-    tbody_tag = find_tag(section_tag, 'tbody')
-    pep_row = tbody_tag.find_all('tr')
-
-    for check_row in tqdm(pep_row):
-        status_pep = find_tag(check_row, 'td')
-        preview_status = status_pep.text[1:]
-        one_pep_link = extract_pep_link(check_row)
-        new_pep_soup = get_soup(session, one_pep_link)
-
-        if new_pep_soup is None:
+    workers = getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    result_cache = get_result_cache(cli_args)
+    status_extractor = PEP_STATUS_EXTRACTORS[
+        getattr(cli_args, 'parser', DEFAULT_PARSER)
+    ]
+
+    pep_rows = get_pep_rows(session, result_cache)
+
+    fetch_statuses = partial(
+        fetch_extracted, session,
+        extractor=status_extractor, result_cache=result_cache,
+        workers=workers, parse_pool=get_parse_pool(cli_args),
+        on_error=log_fetch_error,
+    )
+    full_statuses = get_pep_statuses(
+        session, pep_rows, fetch_statuses, result_cache, cli_args
+    )
+
+    for row, full_status_pep in zip(pep_rows, full_statuses):
+        if full_status_pep is None:
             continue
-
-        full_status_pep = extract_pep_status(new_pep_soup)
         sum_status[full_status_pep] += 1
 
         try:
-            if full_status_pep not in EXPECTED_STATUS[preview_status]:
+            if full_status_pep not in EXPECTED_STATUS[row.preview]:
                 message_of_error = (
-                    f'Несовпадающие статусы:\n{one_pep_link}\n'
+                    f'Несовпадающие статусы:\n{row.url}\n'
                     f'Статус в карточке {full_status_pep}\n'
-                    f'Ожидаемые статусы: {EXPECTED_STATUS[preview_status]}'
+                    f'Ожидаемые статусы: {EXPECTED_STATUS[row.preview]}'
                 )
                 logging.warning(message_of_error)
         except KeyError as error:
             raise error
 
-    results.extend(sum_status.items())
-    results.append(('Total', sum(sum_status.values())))
+    yield from sum_status.items()
+    yield 'Total', sum(sum_status.values())
+
+
+def iter_pep_metadata(session, cli_args=None):
+    from tqdm import tqdm
+
+    yield 'PEP', *PEP_HEADER_FIELDS
+    header_extractor = PEP_HEADER_EXTRACTORS[
+        getattr(cli_args, 'parser', DEFAULT_PARSER)
+    ]
+    result_cache = get_result_cache(cli_args)
+
+    pep_rows = get_pep_rows(session, result_cache)
+    headers = fetch_extracted(
+        session, [row.url for row in pep_rows],
+        extractor=header_extractor, result_cache=result_cache,
+        workers=getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        parse_pool=get_parse_pool(cli_args),
+    )
+    for header, row in zip(
+        tqdm(headers, total=len(pep_rows)), pep_rows
+    ):
+        yield (
+            row.number,
+            *('' if value is None else value for value in header),
+        )
+
+
+def pep_metadata(session, cli_args=None):
+    return collect_rows(iter_pep_metadata(session, cli_args), cli_args)
+
+
+def pep(session, cli_args=None):
+    return collect_rows(iter_pep(session, cli_args), cli_args)
+
+
+def cache_stats(session, cli_args=None):
+    cache = session.cache
+    expired = sum(1 for _ in cache.filter(valid=False, expired=True))
+    return [
+        ('Показатель', 'Значение'),
+        ('Хранилище', type(cache).__name__),
+        ('Ответов', len(cache.responses)),
+        ('Устаревших ответов', expired),
+        ('Перенаправлений', len(cache.redirects)),
+        ('Размер на диске, байт', disk_usage(backend_path(cache))),
+    ]
+
+
+def cache_prune(session, cli_args=None):
+    cache = session.cache
+    older_than = getattr(cli_args, 'older_than', None)
+    responses_before = len(cache.responses)
+    cache.delete(
+        expired=True,
+        older_than=(
+            dt.timedelta(days=older_than) if older_than is not None else None
+        ),
+    )
+    if hasattr(cache.responses, 'vacuum'):
+        cache.responses.vacuum()
+    responses_after = len(cache.responses)
+    logging.info(
+        f'Удалено ответов из кеша: {responses_before - responses_after}'
+    )
+    return [
+        ('Показатель', 'Значение'),
+        ('Удалено ответов', responses_before - responses_after),
+        ('Осталось ответов', responses_after),
+    ]
+
+
+def export_corpus(session, cli_args=None):
+    from corpus import iter_cached_pages, write_corpus
+
+    corpus_dir = BASE_DIR / CORPUS_DIR
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
+    corpus_path = corpus_dir / f'corpus_{now_formatted}.bin'
+    pages = write_corpus(corpus_path, iter_cached_pages(session.cache))
+    logging.info(f'Архив страниц сохранён: {corpus_path}')
+    return [
+        ('Показатель', 'Значение'),
+        ('Страниц', pages),
+        ('Размер, байт', corpus_path.stat().st_size),
+        ('Файл', str(corpus_path)),
+    ]
+
+
+def read_history(read, cli_args=None):
+    history_of = getattr(cli_args, 'history_of', 'pep')
+    results = read(history_of)
+    if not results:
+        logging.warning(f'История режима {history_of} пуста')
+        return None
     return results
 
 
+def history(session, cli_args=None):
+    return read_history(get_result_history().timeline, cli_args)
+
+
+def history_diff(session, cli_args=None):
+    return read_history(get_result_history().changes, cli_args)
+
+
+PEP_STATUS_EXTRACTORS = {
+    LXML_PARSER: extract_pep_status_xpath,
+    BS4_PARSER: extract_pep_status,
+}
+PEP_HEADER_EXTRACTORS = {
+    LXML_PARSER: extract_pep_header_xpath,
+    BS4_PARSER: extract_pep_header,
+}
+
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'pep-metadata': pep_metadata,
+    'cache-stats': cache_stats,
+    'cache-prune': cache_prune,
+    'export-corpus': export_corpus,
+    'history': history,
+    'history-diff': history_diff,
 }
 
 
-def main():
-    configure_logging()
-    logging.info('Парсер запущен!')
+def expand_modes(modes):
+    expanded = []
+    for mode in modes:
+        expanded.extend(BULK_MODES if mode == ALL_MODES else (mode,))
+    return list(dict.fromkeys(expanded))
 
-    arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
-    args = arg_parser.parse_args()
-
-    logging.info(f'Аргументы командной строки: {args}')
 
-    session = requests_cache.CachedSession()
-    if args.clear_cache:
-        session.cache.clear()
-
-    parser_mode = args.mode
+def run_mode(session, args, output_lock, parser_mode):
+    mode_args = Namespace(**{**vars(args), 'mode': parser_mode})
     if parser_mode in MODE_TO_FUNCTION:
         try:
-            results = MODE_TO_FUNCTION[parser_mode](session)
+            results = MODE_TO_FUNCTION[parser_mode](session, mode_args)
+            if results is not None and args.history and (
+                    parser_mode in HISTORY_MODES):
+                results = record_history(parser_mode, results)
+            if results is not None and len(args.mode) > 1:
+                # Строки собираются вне блокировки вывода, иначе режимы
+                # с потоковым выводом загружали бы страницы по очереди.
+                results = list(results)
             if results is not None:
-                control_output(results, args)
+                with output_lock:
+                    control_output(results, mode_args)
         except Exception as e:
             logging.error(f'Ошибка при выполнении режима {parser_mode}: {e}')
     else:
         logging.error(f'Недопустимый режим работы парсера: {parser_mode}')
 
+
+def main():
+    configure_logging()
+    logging.info('Парсер запущен!')
+
+    arg_parser = configure_argument_parser((*MODE_TO_FUNCTION, ALL_MODES))
+    args = arg_parser.parse_args()
+    args.mode = expand_modes(args.mode)
+
+    logging.info(f'Аргументы командной строки: {args}')
+
+    profiler.enabled = args.profile or args.profile_json is not None
+    session = configure_session(args)
+    result_cache = get_result_cache(args)
+    if args.clear_cache and result_cache is not None:
+        result_cache.clear()
+
+    output_lock = threading.Lock()
+    for _ in map_concurrently(
+        partial(run_mode, session, args, output_lock),
+        args.mode,
+        len(args.mode),
+    ):
+        pass
+
+    session.close()
+
+    if args.profile:
+        profiler.log_summary()
+    if args.profile_json is not None:
+        profiler.dump_json(args.profile_json)
+
     logging.info('Парсер завершил работу.')
 
 
@@ -1,11 +1,12 @@
 import csv
 import datetime as dt
+from itertools import islice
+import json
 import logging
 
-from prettytable import PrettyTable
-
-from constants import (BASE_DIR, DATETIME_FORMAT,
-                       FILE_OUTPUT, PRETTY_OUTPUT, RESULTS_DIR)
+from constants import (BASE_DIR, DATETIME_FORMAT, FILE_OUTPUT, JSONL_OUTPUT,
+                       PARQUET_BATCH_ROWS, PARQUET_COMPRESSION,
+                       PARQUET_OUTPUT, PRETTY_OUTPUT, RESULTS_DIR)
 
 
 def default_output(results, cli_args=None):
@@ -14,34 +15,104 @@ def default_output(results, cli_args=None):
 
 
 def pretty_output(results, cli_args):
+    from prettytable import PrettyTable
+
+    rows = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(rows))
     print(table)
 
 
-def file_output(results, cli_args):
+def get_results_path(cli_args, extension):
     results_dir = BASE_DIR / RESULTS_DIR
     results_dir.mkdir(parents=True, exist_ok=True)
     parser_mode = cli_args.mode
     now = dt.datetime.now()
     now_formatted = now.strftime(DATETIME_FORMAT)
-    file_name = f'{parser_mode}_{now_formatted}.csv'
-    file_path = results_dir / file_name
-
-    if results:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            writer = csv.writer(f, dialect='unix')
-            writer.writerows(results)
-        logging.info(f'Файл с результатами был сохранён: {file_path}')
-    else:
+    file_name = f'{parser_mode}_{now_formatted}.{extension}'
+    return results_dir / file_name
+
+
+def split_header(results):
+    rows = iter(results)
+    header = next(rows, None)
+    if header is None:
+        logging.warning('Нет результатов для сохранения в файл.')
+    return header, rows
+
+
+def file_output(results, cli_args):
+    header, rows = split_header(results)
+    if header is None:
+        return
+    file_path = get_results_path(cli_args, 'csv')
+
+    with open(file_path, 'w', encoding='utf-8') as f:
+        writer = csv.writer(f, dialect='unix')
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            f.flush()
+    logging.info(f'Файл с результатами был сохранён: {file_path}')
+
+
+def jsonl_output(results, cli_args):
+    header, rows = split_header(results)
+    if header is None:
+        return
+    file_path = get_results_path(cli_args, 'jsonl')
+
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False))
+            f.write('\n')
+            f.flush()
+    logging.info(f'Файл с результатами был сохранён: {file_path}')
+
+
+def parquet_output(results, cli_args):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            'Для вывода в формате Parquet установите pyarrow: '
+            'pip install pyarrow'
+        ) from error
+
+    header, rows = split_header(results)
+    if header is None:
+        return
+    file_path = get_results_path(cli_args, 'parquet')
+
+    writer = None
+    try:
+        while batch := list(islice(rows, PARQUET_BATCH_ROWS)):
+            table = pa.Table.from_pylist(
+                [dict(zip(header, row)) for row in batch],
+                schema=writer.schema if writer else None,
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    file_path, table.schema, compression=PARQUET_COMPRESSION,
+                )
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
         logging.warning('Нет результатов для сохранения в файл.')
+        return
+    logging.info(f'Файл с результатами был сохранён: {file_path}')
 
 
 OUTPUT_FUNCTIONS = {
     PRETTY_OUTPUT: pretty_output,
     FILE_OUTPUT: file_output,
+    JSONL_OUTPUT: jsonl_output,
+    PARQUET_OUTPUT: parquet_output,
     None: default_output,
 }
 
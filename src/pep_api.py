@@ -0,0 +1,53 @@
+import logging
+import random
+
+from constants import PEP_API_URL
+from utils import extract_pep_api_statuses, get_extracted
+
+
+def verify_pep_statuses(links, statuses, fetch_statuses, sample_size):
+    """Сверяет статусы из API со страницами случайной выборки PEP.
+
+    При расхождении статус берётся со страницы PEP.
+    """
+    sample = random.sample(range(len(links)), min(sample_size, len(links)))
+    page_statuses = fetch_statuses([links[index] for index in sample])
+    for index, page_status in zip(sample, page_statuses):
+        if page_status is not None and page_status != statuses[index]:
+            logging.warning(
+                f'Статус PEP в API не совпадает со страницей:\n'
+                f'{links[index]}\n'
+                f'Статус в API {statuses[index]}\n'
+                f'Статус в карточке {page_status}'
+            )
+            statuses[index] = page_status
+
+
+def api_pep_statuses(session, pep_rows, fetch_statuses, result_cache=None,
+                     verify_sample=0):
+    """Возвращает статусы PEP из API одним запросом.
+
+    PEP, которых нет в API, загружаются со своих страниц.
+    Статусы возвращаются в порядке строк индекса.
+    """
+    api_statuses = dict(get_extracted(
+        session, PEP_API_URL, extract_pep_api_statuses, result_cache
+    ))
+    links = [row.url for row in pep_rows]
+    missing_links = [
+        row.url for row in pep_rows if row.number not in api_statuses
+    ]
+    fetched = {}
+    if missing_links:
+        logging.info(
+            f'PEP без статуса в API: {len(missing_links)}, '
+            'загрузка со страниц PEP'
+        )
+        fetched = dict(zip(missing_links, fetch_statuses(missing_links)))
+    statuses = [
+        fetched[row.url] if row.url in fetched else api_statuses[row.number]
+        for row in pep_rows
+    ]
+    if verify_sample:
+        verify_pep_statuses(links, statuses, fetch_statuses, verify_sample)
+    return statuses
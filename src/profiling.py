@@ -0,0 +1,116 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import json
+import logging
+import threading
+import time
+
+STAGES = ('network', 'parse', 'extract')
+SLOWEST_URLS_COUNT = 5
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+class RequestProfiler:
+    """Сбор времени загрузки и разбора страниц по каждому URL."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._records = defaultdict(lambda: defaultdict(int))
+
+    def record(self, url, **metrics):
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, value in metrics.items():
+                self._records[url][name] += value
+
+    @contextmanager
+    def measure(self, url, stage):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(url, **{stage: time.perf_counter() - started})
+
+    def record_response(self, url, response, elapsed):
+        if not self.enabled:
+            return
+        self.record(
+            url,
+            network=elapsed,
+            requests=1,
+            cache_hits=int(getattr(response, 'from_cache', False)),
+            bytes=len(response.content),
+        )
+
+    def summary(self):
+        with self._lock:
+            records = {url: dict(metrics)
+                       for url, metrics in self._records.items()}
+        requests_count = sum(m.get('requests', 0) for m in records.values())
+        cache_hits = sum(m.get('cache_hits', 0) for m in records.values())
+        stages = {}
+        for stage in STAGES:
+            values = [m[stage] for m in records.values() if stage in m]
+            if values:
+                stages[stage] = {
+                    'total': sum(values),
+                    'p50': percentile(values, 0.5),
+                    'p95': percentile(values, 0.95),
+                }
+        slowest = sorted(
+            records.items(),
+            key=lambda item: sum(item[1].get(stage, 0) for stage in STAGES),
+            reverse=True,
+        )[:SLOWEST_URLS_COUNT]
+        return {
+            'urls': len(records),
+            'requests': requests_count,
+            'cache_hit_ratio': (
+                cache_hits / requests_count if requests_count else 0
+            ),
+            'bytes': sum(m.get('bytes', 0) for m in records.values()),
+            'stages': stages,
+            'slowest': [
+                {'url': url, **metrics} for url, metrics in slowest
+            ],
+            'records': records,
+        }
+
+    def log_summary(self):
+        summary = self.summary()
+        lines = [
+            f'Профиль запуска: URL {summary["urls"]}, '
+            f'запросов {summary["requests"]}, '
+            f'попаданий в кеш {summary["cache_hit_ratio"]:.0%}, '
+            f'загружено байт {summary["bytes"]}'
+        ]
+        for stage, timings in summary['stages'].items():
+            lines.append(
+                f'{stage}: всего {timings["total"]:.3f} с, '
+                f'p50 {timings["p50"]:.3f} с, p95 {timings["p95"]:.3f} с'
+            )
+        lines.append('Самые медленные URL:')
+        for record in summary['slowest']:
+            timings = ', '.join(
+                f'{stage} {record[stage]:.3f} с'
+                for stage in STAGES if stage in record
+            )
+            lines.append(f'{record["url"]}: {timings}')
+        logging.info('\n'.join(lines))
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+        logging.info(f'Профиль запуска сохранён: {path}')
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,130 @@
+import logging
+import re
+
+from constants import (DOCS_SIDEBAR_PAGE, DOWNLOAD_PAGE, PEP_INDEX_PAGE,
+                       PEP_PAGE, WHATS_NEW_INDEX_PAGE, WHATS_NEW_PAGE)
+from exceptions import ParserFindTagException
+
+PYTHON_VERSION_PATTERN = re.compile(
+    r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+)
+PDF_A4_PATTERN = re.compile(r'.+pdf-a4\.zip$')
+
+
+def compile_attribute(name, value):
+    if name == 'class':
+        classes = frozenset(value.split())
+        return lambda tag: classes <= frozenset(tag.get('class', ()))
+    if isinstance(value, re.Pattern):
+        return lambda tag: value.search(tag.get(name) or '') is not None
+    return lambda tag: tag.get(name) == value
+
+
+class Rule:
+    """Предварительно скомпилированное правило поиска тега.
+
+    Правило с дочерними правилами собирает теги внутри найденного
+    элемента в отдельную группу.
+    """
+
+    __slots__ = ('name', 'tags', 'checks', 'many', 'children')
+
+    def __init__(self, name, tag, attrs=None, many=False, children=()):
+        self.name = name
+        self.tags = frozenset((tag,) if isinstance(tag, str) else tag)
+        self.checks = tuple(
+            compile_attribute(attr, value)
+            for attr, value in (attrs or {}).items()
+        )
+        self.many = many
+        self.children = children
+
+    def matches(self, tag):
+        return tag.name in self.tags and all(
+            check(tag) for check in self.checks
+        )
+
+
+class Match(dict):
+    """Теги, найденные по правилам внутри элемента."""
+
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        super().__init__()
+        self.element = element
+
+    def require(self, name):
+        if name not in self:
+            error_msg = f'Не найден тег по правилу {name}'
+            logging.error(error_msg, stack_info=True)
+            raise ParserFindTagException(error_msg)
+        return self[name]
+
+
+def walk(element, rules, match):
+    for child in element.children:
+        if child.name is None:
+            continue
+        descend = True
+        for rule in rules:
+            if not rule.matches(child) or (
+                    not rule.many and rule.name in match):
+                continue
+            value = child
+            if rule.children:
+                value = Match(child)
+                walk(child, rule.children, value)
+                descend = False
+            if rule.many:
+                match.setdefault(rule.name, []).append(value)
+            else:
+                match[rule.name] = value
+        if descend:
+            walk(child, rules, match)
+
+
+def select(root, page_type):
+    """Находит все теги по правилам страницы за один обход дерева."""
+    match = Match(root)
+    walk(root, RULE_SETS[page_type], match)
+    return match
+
+
+RULE_SETS = {
+    PEP_INDEX_PAGE: (
+        Rule('index', 'section', {'id': 'numerical-index'}, children=(
+            Rule('body', 'tbody', children=(
+                Rule('rows', 'tr', many=True, children=(
+                    Rule('preview', 'td'),
+                    Rule('links', 'a', many=True),
+                )),
+            )),
+        )),
+    ),
+    PEP_PAGE: (
+        Rule('header', 'dl', {'class': 'rfc2822 field-list simple'},
+             children=(Rule('fields', ('dt', 'dd'), many=True),)),
+    ),
+    WHATS_NEW_INDEX_PAGE: (
+        Rule('index', 'section', {'id': 'what-s-new-in-python'}, children=(
+            Rule('toctree', 'div', {'class': 'toctree-wrapper'}, children=(
+                Rule('entries', 'li', {'class': 'toctree-l1'}, many=True,
+                     children=(Rule('link', 'a'),)),
+            )),
+        )),
+    ),
+    WHATS_NEW_PAGE: (
+        Rule('title', 'h1'),
+        Rule('authors', 'dl'),
+    ),
+    DOCS_SIDEBAR_PAGE: (
+        Rule('sidebar', 'div', {'class': 'sphinxsidebarwrapper'}, children=(
+            Rule('lists', 'ul', many=True,
+                 children=(Rule('links', 'a', many=True),)),
+        )),
+    ),
+    DOWNLOAD_PAGE: (
+        Rule('archive', 'a', {'href': PDF_A4_PATTERN}),
+    ),
+}
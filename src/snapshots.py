@@ -0,0 +1,69 @@
+import logging
+import sqlite3
+
+from constants import BASE_DIR, CACHE_DIR, PEP_SNAPSHOT_FILE
+
+
+class PepSnapshot:
+    """Снимок статусов PEP с прошлого запуска парсера."""
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS peps ('
+                'link TEXT PRIMARY KEY, preview_status TEXT, '
+                'full_status TEXT)'
+            )
+
+    def load(self):
+        return {
+            link: (preview_status, full_status)
+            for link, preview_status, full_status in self._connection.execute(
+                'SELECT link, preview_status, full_status FROM peps'
+            )
+        }
+
+    def save(self, records):
+        with self._connection:
+            self._connection.execute('DELETE FROM peps')
+            self._connection.executemany(
+                'INSERT INTO peps VALUES (?, ?, ?)', records
+            )
+
+
+def open_pep_snapshot():
+    return PepSnapshot(BASE_DIR / CACHE_DIR / PEP_SNAPSHOT_FILE)
+
+
+def sync_pep_statuses(snapshot, pep_rows, fetch_statuses):
+    """Загружает только новые и изменившиеся PEP.
+
+    Возвращает полные статусы всех PEP в порядке строк индекса.
+    PEP, которые не удалось загрузить, не попадают в снимок
+    и загружаются при следующем запуске.
+    """
+    from tqdm import tqdm
+
+    known = snapshot.load()
+    changed_links = [
+        row.url for row in pep_rows
+        if known.get(row.url, (None, None))[0] != row.preview
+    ]
+    logging.info(
+        f'Новых и изменившихся PEP: {len(changed_links)} из {len(pep_rows)}'
+    )
+    fetched = {
+        link: status for status, link in zip(
+            tqdm(fetch_statuses(changed_links), total=len(changed_links)),
+            changed_links,
+        )
+    }
+    records = [
+        (row.url, row.preview,
+         fetched[row.url] if row.url in fetched else known[row.url][1])
+        for row in pep_rows
+    ]
+    snapshot.save([record for record in records if record[2] is not None])
+    return [full_status for _, _, full_status in records]
@@ -0,0 +1,153 @@
+import datetime as dt
+from email.utils import parsedate_to_datetime
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from constants import (DEFAULT_RETRIES, LATENCY_TOLERANCE,
+                       RETRY_BACKOFF_FACTOR, RETRY_METHODS,
+                       RETRY_STATUSES)
+
+
+def retry_after_seconds(response):
+    """Возвращает задержку из заголовка Retry-After в секундах."""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(
+        (retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds(), 0
+    )
+
+
+class HostLimiter:
+    """Ограничение запросов к одному сайту.
+
+    Частота запросов ограничивается корзиной токенов, а число
+    одновременных запросов подстраивается под задержки и ошибки:
+    растёт на единицу за окно быстрых ответов, так же медленно
+    уменьшается при росте задержки и уменьшается вдвое при ошибке
+    или ответе 429/5xx.
+    """
+
+    def __init__(self, rate=None, max_in_flight=1):
+        self.rate = rate
+        self.capacity = max(rate or 0, 1)
+        self.tokens = self.capacity
+        self.max_in_flight = max_in_flight
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self.paused_until = 0
+        self.min_latency = None
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self._updated) * self.rate,
+            )
+        self._updated = now
+
+    def _wait_time(self, now):
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.rate and self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if wait == 0:
+                    if self.rate:
+                        self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                self._condition.wait(timeout=wait)
+
+    def release(self, elapsed=None, failed=False):
+        with self._condition:
+            self.in_flight -= 1
+            if failed:
+                self.limit = max(1.0, self.limit / 2)
+            elif elapsed is not None:
+                if self.min_latency is None or elapsed < self.min_latency:
+                    self.min_latency = elapsed
+                if elapsed <= LATENCY_TOLERANCE * self.min_latency:
+                    self.limit = min(
+                        float(self.max_in_flight), self.limit + 1 / self.limit
+                    )
+                else:
+                    self.limit = max(1.0, self.limit - 1 / self.limit)
+            self._condition.notify_all()
+
+    def pause(self, seconds):
+        with self._condition:
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + seconds
+            )
+
+
+class RateLimiter:
+    """Набор ограничителей запросов по сайтам."""
+
+    def __init__(self, rate=None, max_in_flight=1):
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, name):
+        with self._lock:
+            if name not in self._hosts:
+                self._hosts[name] = HostLimiter(self.rate, self.max_in_flight)
+            return self._hosts[name]
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """Адаптер, соблюдающий ограничения запросов к каждому сайту.
+
+    Ответы 429 и 5xx повторяются здесь, а не в urllib3, чтобы пауза
+    из Retry-After действовала на все потоки, обращающиеся к сайту.
+    """
+
+    def __init__(self, rate_limiter, retries=DEFAULT_RETRIES, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+
+    def send(self, request, **kwargs):
+        limiter = self.rate_limiter.host(urlsplit(request.url).netloc)
+        for attempt in range(self.retries + 1):
+            limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except Exception:
+                limiter.release(failed=True)
+                raise
+            throttled = response.status_code in RETRY_STATUSES
+            limiter.release(time.perf_counter() - started, failed=throttled)
+            if (not throttled or attempt == self.retries
+                    or request.method not in RETRY_METHODS):
+                return response
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = RETRY_BACKOFF_FACTOR * 2 ** attempt
+            limiter.pause(delay)
+            response.close()
+        return response
@@ -1,22 +1,162 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
+import json
 import logging
+import multiprocessing
+import re
+import sys
+import time
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
-from constants import PEP_URL
+from caches import response_fingerprint
+from constants import (DEFAULT_WORKERS, DOCS_SIDEBAR_PAGE, DOWNLOAD_CHUNK_SIZE,
+                       DOWNLOAD_PAGE, PEP_HEADER_FIELDS, PEP_INDEX_PAGE,
+                       PEP_PAGE, PEP_URL, WHATS_NEW_INDEX_PAGE, WHATS_NEW_PAGE,
+                       WHATS_NEW_URL)
 from exceptions import ParserFindTagException
+from profiling import profiler
+from rules import select
+
+STRAINER_SPECS = {
+    PEP_INDEX_PAGE: ('section', {'id': 'numerical-index'}),
+    PEP_PAGE: ('dl', {'class': 'rfc2822 field-list simple'}),
+    WHATS_NEW_INDEX_PAGE: ('section', {'id': 'what-s-new-in-python'}),
+    WHATS_NEW_PAGE: (['h1', 'dl'], {}),
+    DOCS_SIDEBAR_PAGE: ('div', {'class': 'sphinxsidebarwrapper'}),
+    DOWNLOAD_PAGE: ('a', {}),
+}
+
+PEP_HEADER_XPATH = (
+    '//dl[contains(concat(" ", normalize-space(@class), " "), " rfc2822 ")]'
+)
+PEP_STATUS_XPATH = (
+    PEP_HEADER_XPATH
+    + '/dt[normalize-space(.) = "Status:"]/following-sibling::dd[1]'
+)
+PEP_LINK_NUMBER = re.compile(r'pep-0*(\d+)')
+
+PEP_HEADER_ATTRIBUTES = {
+    field: field.lower().replace('-', '_') for field in PEP_HEADER_FIELDS
+}
+PepHeader = namedtuple(
+    'PepHeader',
+    PEP_HEADER_ATTRIBUTES.values(),
+    defaults=(None,) * len(PEP_HEADER_ATTRIBUTES),
+)
+
+PepIndexRow = namedtuple('PepIndexRow', ('number', 'preview', 'title', 'url'))
+
+
+def pep_number(link):
+    return int(PEP_LINK_NUMBER.search(link).group(1))
+
+
+def extract_pep_row(row):
+    link, *title = row.require('links')
+    url = urljoin(PEP_URL, link['href'])
+    return PepIndexRow(
+        pep_number(url),
+        sys.intern(row.require('preview').get_text()[1:]),
+        ' '.join(title[0].get_text().split()) if title else '',
+        url,
+    )
+
+
+def extract_pep_rows(soup):
+    """Разбирает индекс PEP в список компактных строк PepIndexRow.
+
+    Строки не ссылаются на дерево документа, поэтому дерево
+    освобождается сразу после разбора.
+    """
+    index = select(soup, PEP_INDEX_PAGE).require('index').require('body')
+    return [extract_pep_row(row) for row in index.get('rows', [])]
 
 
-def extract_pep_link(row):
-    link_tag = find_tag(row, 'a')
-    return urljoin(PEP_URL, link_tag['href'])
+def get_pep_rows(session, result_cache=None):
+    """Возвращает строки индекса PEP.
+
+    Кеш результатов хранит строки как обычные кортежи,
+    поэтому они снова собираются в PepIndexRow.
+    """
+    return [
+        PepIndexRow._make(row)
+        for row in get_extracted(session, PEP_URL, extract_pep_rows,
+                                 result_cache)
+    ]
+
+
+def collect_pep_header(items):
+    """Собирает поля заголовка PEP за один проход по парам dt/dd.
+
+    Принимает пары (имя тега, текст) в порядке документа.
+    """
+    fields = {}
+    attribute = None
+    for tag, text in items:
+        if tag == 'dt':
+            attribute = PEP_HEADER_ATTRIBUTES.get(text.strip().rstrip(':'))
+        elif tag == 'dd' and attribute is not None:
+            fields[attribute] = ' '.join(text.split())
+            attribute = None
+    return PepHeader(**fields)
+
+
+def extract_pep_header(soup):
+    header = select(soup, PEP_PAGE).require('header')
+    return collect_pep_header(
+        (tag.name, tag.get_text()) for tag in header.get('fields', [])
+    )
+
+
+def extract_pep_header_xpath(tree):
+    header_tags = tree.xpath(PEP_HEADER_XPATH)
+    if not header_tags:
+        error_msg = f'Не найден тег dl {PEP_HEADER_XPATH}'
+        logging.error(error_msg, stack_info=True)
+        raise ParserFindTagException(error_msg)
+    return collect_pep_header(
+        (element.tag, element.text_content()) for element in header_tags[0]
+    )
 
 
 def extract_pep_status(soup):
-    pep_tag = find_tag(soup, 'dl',
-                       attrs={'class': 'rfc2822 field-list simple'})
-    full_status_pep = (pep_tag.text).split()
-    return full_status_pep[full_status_pep.index('Status:') + 1]
+    status = extract_pep_header(soup).status
+    if status is None:
+        error_msg = 'Не найден статус в заголовке PEP'
+        logging.error(error_msg, stack_info=True)
+        raise ParserFindTagException(error_msg)
+    return status
+
+
+def extract_pep_status_xpath(tree):
+    status_tags = tree.xpath(PEP_STATUS_XPATH)
+    if not status_tags:
+        error_msg = f'Не найден тег dd {PEP_STATUS_XPATH}'
+        logging.error(error_msg, stack_info=True)
+        raise ParserFindTagException(error_msg)
+    return ' '.join(status_tags[0].text_content().split())
+
+
+def extract_pep_api_statuses(data):
+    return [(int(number), pep['status']) for number, pep in data.items()]
+
+
+def extract_whats_new_links(soup):
+    toctree = select(soup, WHATS_NEW_INDEX_PAGE).require('index').require(
+        'toctree'
+    )
+    return [
+        urljoin(WHATS_NEW_URL, entry.require('link')['href'])
+        for entry in toctree.get('entries', [])
+    ]
+
+
+def extract_whats_new_entry(soup):
+    match = select(soup, WHATS_NEW_PAGE)
+    dl_text = match.require('authors').text.replace('\n', ' ')
+    return match.require('title').text, dl_text
 
 
 def find_tag(soup, tag, attrs=None):
@@ -29,12 +169,249 @@ def find_tag(soup, tag, attrs=None):
 
 
 def get_response(session, url, encoding='utf-8'):
+    started = time.perf_counter()
     response = session.get(url)
+    profiler.record_response(url, response, time.perf_counter() - started)
     response.encoding = encoding
     response.raise_for_status()
     return response
 
 
-def get_soup(session, url):
+@lru_cache(maxsize=None)
+def get_strainer(name):
+    from bs4 import SoupStrainer
+
+    tag, attrs = STRAINER_SPECS[name]
+    return SoupStrainer(tag, attrs=attrs)
+
+
+def make_soup(markup, parse_only=None):
+    from bs4 import BeautifulSoup
+
+    if isinstance(parse_only, str):
+        parse_only = get_strainer(parse_only)
+    return BeautifulSoup(markup, features='lxml', parse_only=parse_only)
+
+
+def build_soup(url, response, parse_only=None):
+    with profiler.measure(url, 'parse'):
+        return make_soup(response.text, parse_only)
+
+
+def get_soup(session, url, parse_only=None):
     response = get_response(session, url)
-    return BeautifulSoup(response.text, features='lxml')
+    return build_soup(url, response, parse_only)
+
+
+def build_document(response, extractor):
+    if extractor in JSON_EXTRACTORS:
+        return json.loads(response.content)
+    if extractor in XPATH_EXTRACTORS:
+        import lxml.html
+
+        return lxml.html.fromstring(response.content)
+    return make_soup(response.text, EXTRACTOR_PAGES.get(extractor))
+
+
+def extract_content(content, extractor):
+    """Разбирает тело ответа в процессе-обработчике пула.
+
+    Возвращает только результат извлечения, а не дерево документа.
+    """
+    from requests.models import Response
+
+    response = Response()
+    response._content = content
+    response.encoding = 'utf-8'
+    return extractor(build_document(response, extractor))
+
+
+def extract(url, response, extractor, parse_pool=None):
+    if parse_pool is not None:
+        with profiler.measure(url, 'parse'):
+            return parse_pool.submit(
+                extract_content, response.content, extractor
+            ).result()
+    with profiler.measure(url, 'parse'):
+        document = build_document(response, extractor)
+    with profiler.measure(url, 'extract'):
+        return extractor(document)
+
+
+def extract_response(url, response, extractor, result_cache=None,
+                     parse_pool=None):
+    """Возвращает результат извлечения данных из ответа.
+
+    Если передан кеш результатов и отпечаток ответа не изменился,
+    страница не разбирается повторно. Записи, сохранённые другой
+    версией извлекателя, считаются отсутствующими.
+    """
+    if result_cache is None:
+        return extract(url, response, extractor, parse_pool)
+
+    fingerprint = response_fingerprint(response)
+    key = result_key(extractor)
+    result = result_cache.get(url, key, fingerprint)
+    if result is None:
+        result = extract(url, response, extractor, parse_pool)
+        result_cache.set(url, key, fingerprint, result)
+    return result
+
+
+def get_extracted(session, url, extractor, result_cache=None,
+                  parse_pool=None):
+    response = get_response(session, url)
+    return extract_response(url, response, extractor, result_cache,
+                            parse_pool)
+
+
+def isolate_errors(function, on_error):
+    """Оборачивает функцию так, чтобы ошибка не прерывала обработку.
+
+    Вместо исключения вызывается on_error(item, error)
+    и возвращается None.
+    """
+    def isolated(item):
+        try:
+            return function(item)
+        except Exception as error:
+            on_error(item, error)
+            return None
+    return isolated
+
+
+def log_fetch_error(url, error):
+    logging.warning(f'Не удалось обработать страницу {url}: {error}')
+
+
+def fetch_extracted(session, urls, extractor, result_cache=None,
+                    workers=DEFAULT_WORKERS, parse_pool=None, on_error=None):
+    """Загружает страницы параллельно и извлекает из них данные.
+
+    Результаты возвращаются в порядке исходных URL. Если передан
+    on_error, ошибка на одной странице не прерывает загрузку
+    остальных, а вместо результата возвращается None.
+    """
+    if hasattr(session, 'map_extracted'):
+        return session.map_extracted(
+            urls, extractor, result_cache, parse_pool, on_error
+        )
+    function = partial(get_extracted, session, extractor=extractor,
+                       result_cache=result_cache, parse_pool=parse_pool)
+    if on_error is not None:
+        function = isolate_errors(function, on_error)
+    return map_concurrently(function, urls, workers)
+
+
+def read_etag(path):
+    if not path.exists():
+        return None
+    return path.read_text(encoding='utf-8')
+
+
+def collect_rows(rows, cli_args=None):
+    if getattr(cli_args, 'stream', False):
+        return rows
+    return list(rows)
+
+
+def download_file(session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Скачивает файл по частям в обход кеша запросов.
+
+    Прерванная загрузка продолжается с места остановки,
+    а уже скачанный актуальный файл не загружается повторно.
+    Возвращает True, если файл был загружен.
+    """
+    part_path = path.with_name(path.name + '.part')
+    etag_path = path.with_name(path.name + '.etag')
+    part_etag_path = path.with_name(path.name + '.part.etag')
+
+    cache_disabled = getattr(session, 'cache_disabled', nullcontext)
+    with cache_disabled():
+        head = session.head(url, allow_redirects=True)
+        head.raise_for_status()
+        etag = head.headers.get('ETag')
+        size = head.headers.get('Content-Length')
+
+        if path.exists() and (
+            etag is not None and read_etag(etag_path) == etag
+            or etag is None and size is not None
+            and path.stat().st_size == int(size)
+        ):
+            logging.info(f'Файл {path} не изменился, загрузка пропущена')
+            return False
+
+        headers = {}
+        if (part_path.exists() and etag is not None
+                and read_etag(part_etag_path) == etag):
+            headers['Range'] = f'bytes={part_path.stat().st_size}-'
+            headers['If-Range'] = etag
+        if etag is not None:
+            part_etag_path.write_text(etag, encoding='utf-8')
+
+        with session.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            mode = 'ab' if response.status_code == 206 else 'wb'
+            with open(part_path, mode) as file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+
+    part_path.replace(path)
+    if etag is not None:
+        part_etag_path.replace(etag_path)
+    return True
+
+
+@lru_cache(maxsize=None)
+def open_parse_pool(processes):
+    """Создаёт пул процессов для разбора страниц.
+
+    Процессы запускаются методом spawn: пул стартует из потоков
+    загрузки, и при fork дочерний процесс мог бы унаследовать
+    захваченные блокировки логирования или SQLite.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+
+
+def get_parse_pool(cli_args):
+    processes = getattr(cli_args, 'parse_processes', 0)
+    if not processes:
+        return None
+    return open_parse_pool(processes)
+
+
+def map_concurrently(function, items, workers=DEFAULT_WORKERS):
+    """Применяет функцию к элементам в пуле потоков.
+
+    Результаты возвращаются в порядке исходных элементов.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, items)
+
+
+EXTRACTOR_PAGES = {
+    extract_pep_rows: PEP_INDEX_PAGE,
+    extract_pep_status: PEP_PAGE,
+    extract_pep_header: PEP_PAGE,
+    extract_whats_new_links: WHATS_NEW_INDEX_PAGE,
+    extract_whats_new_entry: WHATS_NEW_PAGE,
+}
+XPATH_EXTRACTORS = {extract_pep_status_xpath, extract_pep_header_xpath}
+JSON_EXTRACTORS = {extract_pep_api_statuses}
+RESULT_VERSIONS = {
+    extract_pep_rows: 2,
+    extract_pep_status: 2,
+    extract_pep_status_xpath: 2,
+}
+
+
+def result_key(extractor):
+    """Возвращает ключ извлекателя в кеше результатов.
+
+    Версию извлекателя в RESULT_VERSIONS нужно увеличивать
+    при каждом изменении формата его результата.
+    """
+    return f'{extractor.__name__}@{RESULT_VERSIONS.get(extractor, 1)}'
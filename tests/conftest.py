@@ -110,3 +110,90 @@ def records():
         result = results[mode]
         return converting(result)
     return _records
+
+
+PEP_INDEX_URL = 'https://peps.python.org/'
+PEP_INDEX_PAGE = '''
+<section id="numerical-index"><table><tbody>
+<tr><td><abbr>IF</abbr></td><td><a href="pep-0001/">1</a></td></tr>
+<tr><td><abbr>SA</abbr></td><td><a href="pep-0008/">8</a></td></tr>
+<tr><td><abbr>SR</abbr></td><td><a href="pep-0666/">666</a></td></tr>
+<tr><td><abbr>S</abbr></td><td><a href="pep-0750/">750</a></td></tr>
+</tbody></table></section>
+'''
+PEP_PAGE = '''
+<h1>PEP {number}</h1>
+<dl class="rfc2822 field-list simple">
+<dt class="field-odd">Author<span class="colon">:</span></dt>
+<dd class="field-odd">Guido van Rossum</dd>
+<dt class="field-even">Status<span class="colon">:</span></dt>
+<dd class="field-even"><abbr>{status}</abbr></dd>
+<dt class="field-odd">Type<span class="colon">:</span></dt>
+<dd class="field-odd">Process</dd>
+</dl>
+'''
+PEP_STATUSES = {
+    '0001': 'Active',
+    '0008': 'Active',
+    '0666': 'Rejected',
+    '0750': 'Final',
+}
+
+
+def register_pep_pages(mock):
+    mock.get(PEP_INDEX_URL, text=PEP_INDEX_PAGE)
+    for number, status in PEP_STATUSES.items():
+        mock.get(
+            f'{PEP_INDEX_URL}pep-{number}/',
+            text=PEP_PAGE.format(number=int(number), status=status),
+        )
+
+
+PEP_API_URL = 'https://peps.python.org/api/peps.json'
+PEP_API_FIXTURE = BASE_DIR / 'tests' / 'fixture_data' / 'peps.json'
+
+
+def register_pep_api(mock):
+    mock.get(
+        PEP_API_URL,
+        content=PEP_API_FIXTURE.read_bytes(),
+        headers={'Content-Type': 'application/json'},
+    )
+
+
+@pytest.fixture
+def pep_mocker():
+    with requests_mock.Mocker() as mock:
+        register_pep_pages(mock)
+        yield mock
+
+
+WHATS_NEW_INDEX_URL = 'https://docs.python.org/3/whatsnew/'
+WHATS_NEW_INDEX_PAGE = '''
+<section id="what-s-new-in-python"><div class="toctree-wrapper"><ul>
+<li class="toctree-l1"><a href="3.13.html">3.13</a></li>
+<li class="toctree-l1"><a href="3.12.html">3.12</a></li>
+<li class="toctree-l1"><a href="3.11.html">3.11</a></li>
+</ul></div></section>
+'''
+WHATS_NEW_PAGE = '''
+<h1>What’s New In Python {version}</h1>
+<dl><dt>Editor</dt>
+<dd>Author {version}</dd></dl>
+'''
+
+
+def register_whats_new_pages(mock):
+    mock.get(WHATS_NEW_INDEX_URL, text=WHATS_NEW_INDEX_PAGE)
+    for version in ('3.13', '3.12', '3.11'):
+        mock.get(
+            f'{WHATS_NEW_INDEX_URL}{version}.html',
+            text=WHATS_NEW_PAGE.format(version=version),
+        )
+
+
+@pytest.fixture
+def whats_new_mocker():
+    with requests_mock.Mocker() as mock:
+        register_whats_new_pages(mock)
+        yield mock
@@ -0,0 +1,71 @@
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+
+from conftest import PEP_PAGE, PEP_STATUSES
+
+try:
+    import async_engine
+    from profiling import profiler
+    import utils
+except (ModuleNotFoundError, ImportError):
+    pytest.skip('Асинхронный движок не установлен', allow_module_level=True)
+
+
+@pytest.fixture
+def pep_server(tmp_path):
+    pages_dir = tmp_path / 'pages'
+    for number, status in PEP_STATUSES.items():
+        page_dir = pages_dir / f'pep-{number}'
+        page_dir.mkdir(parents=True)
+        (page_dir / 'index.html').write_text(
+            PEP_PAGE.format(number=int(number), status=status)
+        )
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        partial(SimpleHTTPRequestHandler, directory=str(pages_dir)),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    monkeypatch.setattr(async_engine, 'BASE_DIR', tmp_path)
+    engine = async_engine.AsyncEngine(workers=2)
+    yield engine
+    engine.close()
+
+
+def test_async_engine_keeps_order_and_caches(engine, pep_server):
+    urls = [f'{pep_server}pep-{number}/' for number in PEP_STATUSES]
+    got = list(utils.fetch_extracted(
+        engine, urls, utils.extract_pep_status_xpath
+    ))
+    assert got == list(PEP_STATUSES.values()), (
+        'Асинхронный движок должен возвращать результаты в порядке URL'
+    )
+    response = utils.get_response(engine, urls[0])
+    assert response.from_cache, (
+        'Асинхронный движок должен сохранять ответы в постоянный кеш'
+    )
+    assert 'PEP 1' in utils.get_soup(engine, urls[0]).h1.text
+
+
+def test_async_engine_records_each_request_once(
+        monkeypatch, engine, pep_server
+):
+    monkeypatch.setattr(profiler, 'enabled', True)
+    monkeypatch.setattr(profiler, '_records', type(profiler._records)(
+        profiler._records.default_factory
+    ))
+    urls = [f'{pep_server}pep-{number}/' for number in PEP_STATUSES]
+    list(utils.fetch_extracted(engine, urls, utils.extract_pep_status_xpath))
+    utils.get_response(engine, urls[0])
+    assert profiler.summary()['requests'] == len(urls) + 1, (
+        'Каждый запрос через асинхронный движок учитывается в профиле '
+        'один раз'
+    )
@@ -0,0 +1,75 @@
+from argparse import Namespace
+
+from conftest import PEP_INDEX_URL
+
+try:
+    from src import main
+    import caches
+    import utils
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `caches.py`'
+
+
+def test_result_cache_eviction(tmp_path):
+    cache = caches.ResultCache(tmp_path / 'results.sqlite', max_entries=2)
+    for number in range(3):
+        cache.set(f'url-{number}', 'extractor', 'etag', [number, 'x'])
+    assert cache.get('url-0', 'extractor', 'etag') is None, (
+        'Кеш результатов должен вытеснять давно не использованные записи'
+    )
+    assert cache.get('url-2', 'extractor', 'etag') == (2, 'x')
+    assert cache.get('url-2', 'extractor', 'other-etag') is None, (
+        'Запись кеша должна сбрасываться при изменении отпечатка ответа'
+    )
+
+
+def test_warm_pep_run_skips_parsing(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(caches, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', workers=2, result_cache=True)
+    cold = main.pep(tempfile_session, cli_args)
+
+    def fail_on_parse(*args, **kwargs):
+        raise AssertionError('Страница разбирается повторно')
+
+    monkeypatch.setattr(utils, 'build_document', fail_on_parse)
+    warm = main.pep(tempfile_session, cli_args)
+    assert warm == cold
+
+
+def test_result_cache_ignores_other_extractor_versions(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(caches, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', workers=2, result_cache=True)
+    expected = main.pep(tempfile_session, Namespace(mode='pep', workers=2))
+    result_cache = caches.get_result_cache(cli_args)
+    response = tempfile_session.get(PEP_INDEX_URL)
+    name = utils.extract_pep_rows.__name__
+    for key in (name, f'{name}@1'):
+        result_cache.set(
+            PEP_INDEX_URL, key, caches.response_fingerprint(response),
+            [['F', 'stale-url']],
+        )
+    assert main.pep(tempfile_session, cli_args) == expected, (
+        'Записи кеша, сохранённые другой версией извлекателя, '
+        'не должны использоваться'
+    )
+
+
+def test_disk_usage_counts_only_active_backend(tmp_path):
+    from requests_cache.backends import init_backend
+
+    other_backend_size = 1024 * 1024
+    (tmp_path / 'http_cache.sqlite').write_bytes(b'x' * other_backend_size)
+    backend = init_backend(tmp_path / 'http_cache', 'filesystem')
+    assert caches.backend_path(backend) == tmp_path / 'http_cache'
+    assert caches.disk_usage(
+        caches.backend_path(backend)
+    ) < other_backend_size, (
+        'Размер кеша не должен включать файлы другого хранилища'
+    )
+    assert caches.disk_usage(
+        caches.backend_path(init_backend('http_cache', 'memory'))
+    ) == 0
@@ -0,0 +1,58 @@
+from argparse import Namespace
+
+from conftest import PEP_INDEX_URL, PEP_PAGE
+
+try:
+    from src import main
+    import checkpoints
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoints.py`'
+
+FAILING_PEP_URL = PEP_INDEX_URL + 'pep-0666/'
+
+
+def pep_args(**kwargs):
+    return Namespace(mode='pep', pep_source='html', workers=2, **kwargs)
+
+
+def test_failed_pages_are_retried(tempfile_session, pep_mocker):
+    pep_mocker.get(FAILING_PEP_URL, [
+        {'status_code': 500},
+        {'text': PEP_PAGE.format(number=666, status='Rejected')},
+    ])
+    got = main.pep(tempfile_session, pep_args())
+    assert ('Rejected', 1) in got and ('Total', 4) in got, (
+        'Страница с ошибкой должна загружаться повторно, '
+        'не прерывая обработку остальных PEP'
+    )
+
+
+def test_resume_fetches_only_failed_pages(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(checkpoints, 'BASE_DIR', tmp_path)
+    pep_mocker.get(FAILING_PEP_URL, status_code=500)
+    got = main.pep(tempfile_session, pep_args(checkpoint=True))
+    assert got[-1] == ('Total', 3), (
+        'PEP, который не удалось загрузить, не учитывается в результате'
+    )
+    saved = checkpoints.open_pep_checkpoint().load()
+    assert len(saved) == 3 and FAILING_PEP_URL not in saved, (
+        'В контрольную точку сохраняются загруженные статусы PEP'
+    )
+
+    pep_mocker.reset_mock()
+    tempfile_session.cache.clear()
+    pep_mocker.get(
+        FAILING_PEP_URL,
+        text=PEP_PAGE.format(number=666, status='Rejected'),
+    )
+    got = main.pep(tempfile_session, pep_args(checkpoint=True, resume=True))
+    fetched = [request.url for request in pep_mocker.request_history]
+    assert fetched == [PEP_INDEX_URL, FAILING_PEP_URL], (
+        'С флагом `--resume` загружаются только PEP без сохранённого статуса'
+    )
+    assert got[-1] == ('Total', 4)
+    assert not checkpoints.open_pep_checkpoint().path.exists(), (
+        'После успешного обхода контрольная точка удаляется'
+    )
@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'parquet'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,49 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+def test_cache_revalidation_arguments():
+    parser = configs.configure_argument_parser(['pep'])
+    got = parser.parse_args([
+        'pep', '-r', '--expire-after', '86400',
+        '--expire-url', 'peps.python.org/pep-*=3600',
+    ])
+    assert got.revalidate is True
+    assert got.expire_after == 86400
+    assert got.expire_url == [('peps.python.org/pep-*', 3600)], (
+        'Опция `--expire-url` должна разбираться в пару (шаблон, секунды)'
+    )
+
+
+def test_http_adapter_pool_and_retries():
+    adapter = configs.configure_http_adapter(workers=16, retries=5)
+    assert adapter._pool_maxsize == 16, (
+        'Размер пула соединений должен соответствовать количеству потоков'
+    )
+    assert adapter.max_retries.total == 5
+    assert 429 in adapter.max_retries.status_forcelist
+
+
+@pytest.mark.parametrize('name', ['pickle', 'json'])
+def test_compressed_serializer(name, tempfile_session, pep_mocker):
+    serializer = configs.configure_serializer(name, compress=True)
+    response = tempfile_session.get('https://peps.python.org/')
+    cached = tempfile_session.cache.responses[response.cache_key]
+    restored = serializer.loads(serializer.dumps(cached))
+    assert restored.content == response.content, (
+        'Сжатый сериализатор должен восстанавливать ответ без потерь'
+    )
+
+
+@pytest.mark.parametrize(
+    'option', ['--parse-processes', '--retries', '--verify-sample']
+)
+def test_counts_reject_negative_values(option):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', option, '-1'])
+    assert getattr(
+        parser.parse_args(['pep', option, '0']),
+        option.lstrip('-').replace('-', '_'),
+    ) == 0, f'Опция `{option}` должна принимать ноль'
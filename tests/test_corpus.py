@@ -0,0 +1,67 @@
+from argparse import Namespace
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import PEP_INDEX_URL
+
+try:
+    from src import main
+    import configs
+    import corpus
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `corpus.py`'
+
+
+def pep_args():
+    return Namespace(mode='pep', pep_source='html', workers=2)
+
+
+def test_export_and_replay_corpus(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    expected = main.pep(tempfile_session, pep_args())
+    got = main.export_corpus(tempfile_session)
+    assert got[1] == ('Страниц', 5), (
+        'В архив должны попадать все загруженные страницы'
+    )
+    corpus_path, = (tmp_path / 'corpus').glob('corpus_*.bin')
+
+    pep_mocker.stop()
+    session = configs.configure_replay_session(corpus_path)
+    try:
+        assert main.pep(session, pep_args()) == expected, (
+            'Воспроизведение по архиву должно давать тот же результат'
+        )
+        missing = session.get(PEP_INDEX_URL + 'pep-9999/')
+        assert missing.status_code == 404, (
+            'Страницы, которых нет в архиве, должны возвращаться с кодом 404'
+        )
+    finally:
+        session.close()
+
+
+def test_corpus_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'corpus.bin'
+    path.write_bytes(b'not a corpus at all')
+    with pytest.raises(ValueError):
+        corpus.Corpus(path)
+
+
+def test_corpus_skips_unreadable_cache_entries(
+        tmp_path, tempfile_session, pep_mocker
+):
+    response = tempfile_session.get(PEP_INDEX_URL)
+    cache = SimpleNamespace(responses={
+        'unreadable': None,
+        response.cache_key: tempfile_session.cache.responses[
+            response.cache_key
+        ],
+    })
+    count = corpus.write_corpus(
+        tmp_path / 'corpus.bin', corpus.iter_cached_pages(cache)
+    )
+    assert count == 1, (
+        'Записи кеша, которые не удалось прочитать, должны пропускаться'
+    )
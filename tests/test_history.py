@@ -0,0 +1,65 @@
+import sqlite3
+
+try:
+    from src import main
+    import history
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+
+HEADER = ('Статус', 'Количество')
+
+
+def test_history_stores_only_changed_rows(tmp_path):
+    path = tmp_path / 'history.sqlite'
+    store = history.ResultHistory(path)
+    store.append('pep', [HEADER, ('Active', 2), ('Final', 5)])
+    store.append('pep', [HEADER, ('Active', 2), ('Final', 5)])
+    store.append('pep', [HEADER, ('Active', 2), ('Final', 6)])
+
+    rows_count, = sqlite3.connect(path).execute(
+        'SELECT COUNT(*) FROM rows'
+    ).fetchone()
+    assert rows_count == 3, (
+        'Неизменившиеся строки не должны сохраняться повторно'
+    )
+    timeline = store.timeline('pep')
+    assert timeline[0] == ('Запуск', *HEADER)
+    assert [row[1:] for row in timeline[1:]] == [
+        ('Active', 2), ('Final', 5),
+        ('Active', 2), ('Final', 5),
+        ('Active', 2), ('Final', 6),
+    ], 'История должна восстанавливать строки каждого запуска'
+    assert store.changes('pep') == [
+        ('Изменение', *HEADER), ('+', 'Final', 6), ('-', 'Final', 5),
+    ], 'Проверьте список изменений с прошлого запуска'
+
+
+def test_history_is_recorded_per_mode(monkeypatch, tmp_path):
+    monkeypatch.setattr(history, 'BASE_DIR', tmp_path)
+    rows = [HEADER, ('Active', 2)]
+
+    assert list(history.record_history('pep', iter(rows))) == rows
+    assert history.get_result_history().timeline('whats-new') == []
+    assert history.get_result_history().changes('pep') == [
+        ('Изменение', *HEADER), ('+', 'Active', 2),
+    ]
+
+
+def test_history_keeps_row_order_of_each_run(tmp_path):
+    store = history.ResultHistory(tmp_path / 'history.sqlite')
+    store.append('pep', [HEADER, ('Active', 2), ('Final', 5)])
+    store.append(
+        'pep', [HEADER, ('Active', 2), ('Rejected', 1), ('Final', 5)]
+    )
+    assert [row[1:] for row in store.timeline('pep')[1:]] == [
+        ('Active', 2), ('Final', 5),
+        ('Active', 2), ('Rejected', 1), ('Final', 5),
+    ], 'Строки каждого запуска должны идти в исходном порядке'
+
+
+def test_empty_history_mode(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(history, 'BASE_DIR', tmp_path)
+    assert main.history(None) is None, (
+        'Для пустой истории режим `history` не должен выводить таблицу'
+    )
+    assert 'История режима pep пуста' in caplog.text
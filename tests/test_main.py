@@ -1,5 +1,11 @@
 import pytest
+from argparse import Namespace
 from pathlib import Path
+
+import requests
+
+from conftest import (PEP_API_URL, PEP_INDEX_URL, PEP_PAGE, PEP_STATUSES,
+                      register_pep_api, register_whats_new_pages)
 try:
     from src import main
 except ModuleNotFoundError:
@@ -123,7 +129,11 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'pep',
+                'pep-metadata', 'cache-stats', 'cache-prune', 'history',
+                'history-diff', 'export-corpus',
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,9 +144,239 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'pep',
+                'pep_metadata', 'cache_stats', 'cache_prune', 'history',
+                'history_diff', 'export_corpus',
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('parse_processes', [0, 2])
+@pytest.mark.parametrize('parser', ['lxml', 'bs4'])
+@pytest.mark.parametrize('workers', [1, 4])
+def test_pep_concurrent(
+        tempfile_session, pep_mocker, workers, parser, parse_processes
+):
+    got = main.pep(
+        tempfile_session,
+        Namespace(mode='pep', workers=workers, parser=parser,
+                  parse_processes=parse_processes),
+    )
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 2),
+        ('Rejected', 1),
+        ('Final', 1),
+        ('Total', 4),
+    ], (
+        'Результат режима `pep` не должен зависеть от количества потоков'
+    )
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_whats_new_keeps_toctree_order(
+        tempfile_session, whats_new_mocker, workers
+):
+    got = main.whats_new(
+        tempfile_session, Namespace(mode='whats-new', workers=workers)
+    )
+    links = [link for link, _, _ in got[1:]]
+    assert links == [
+        'https://docs.python.org/3/whatsnew/3.13.html',
+        'https://docs.python.org/3/whatsnew/3.12.html',
+        'https://docs.python.org/3/whatsnew/3.11.html',
+    ], (
+        'Порядок строк режима `whats-new` должен совпадать '
+        'с порядком версий в оглавлении'
+    )
+    assert got[1][1] == 'What’s New In Python 3.13'
+    assert got[1][2] == 'Editor Author 3.13'
+
+
+def test_cache_stats_and_prune(tempfile_session, pep_mocker):
+    main.pep(tempfile_session)
+    stats = dict(main.cache_stats(tempfile_session))
+    assert stats['Ответов'] == 5
+    pruned = dict(main.cache_prune(
+        tempfile_session, Namespace(mode='cache-prune', older_than=None)
+    ))
+    assert pruned['Удалено ответов'] == 0, (
+        'Без `--older-than` из кеша удаляются только устаревшие ответы'
+    )
+    assert pruned['Осталось ответов'] == 5
+
+
+def test_expand_modes():
+    assert main.expand_modes(['pep', 'all']) == [
+        'pep', 'whats-new', 'latest-versions', 'download'
+    ], 'Режим `all` должен раскрываться в основные режимы без повторов'
+
+
+def test_main_runs_several_modes(monkeypatch, tmp_path, pep_mocker):
+    register_whats_new_pages(pep_mocker)
+    import caches
+    import checkpoints
+    import configs
+    import history
+    import outputs
+    import snapshots
+    for module in (caches, checkpoints, configs, history, outputs, snapshots):
+        monkeypatch.setattr(module, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr('sys.argv', [
+        'main.py', 'pep', 'whats-new', '-o', 'file', '--no-result-cache',
+    ])
+    main.main()
+    output_files = sorted(
+        file.name.split('_')[0]
+        for file in (tmp_path / 'results').glob('*.csv')
+    )
+    assert output_files == ['pep', 'whats-new'], (
+        'Результаты каждого режима должны сохраняться в отдельный файл'
+    )
+
+
+def test_main_records_history(monkeypatch, tmp_path, pep_mocker):
+    import caches
+    import checkpoints
+    import configs
+    import history
+    import snapshots
+    for module in (caches, checkpoints, configs, history, snapshots):
+        monkeypatch.setattr(module, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr('sys.argv', [
+        'main.py', 'pep', '--history', '--no-result-cache',
+    ])
+    main.main()
+    timeline = history.get_result_history().timeline('pep')
+    assert timeline[-1][1:] == ('Total', len(PEP_STATUSES)), (
+        'С флагом `--history` результаты режима сохраняются в историю'
+    )
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'bs4'])
+def test_pep_metadata(tempfile_session, pep_mocker, parser):
+    got = main.pep_metadata(
+        tempfile_session,
+        Namespace(mode='pep-metadata', workers=2, parser=parser),
+    )
+    header = got[0]
+    assert header[:2] == ('PEP', 'Author'), (
+        'Первой строкой режима `pep-metadata` должен быть заголовок таблицы'
+    )
+    rows = [dict(zip(header, row)) for row in got[1:]]
+    assert [row['PEP'] for row in rows] == [1, 8, 666, 750]
+    assert [row['Status'] for row in rows] == list(PEP_STATUSES.values())
+    assert {row['Type'] for row in rows} == {'Process'}
+    assert {row['Created'] for row in rows} == {''}, (
+        'Отсутствующие поля заголовка выводятся пустыми строками'
+    )
+
+
+PEP_RESULT = [
+    ('Статус', 'Количество'),
+    ('Active', 2),
+    ('Rejected', 1),
+    ('Final', 1),
+    ('Total', 4),
+]
+
+
+@pytest.mark.parametrize('pep_source', ['api', 'auto'])
+def test_pep_api_source(tempfile_session, pep_mocker, pep_source):
+    register_pep_api(pep_mocker)
+    got = main.pep(
+        tempfile_session, Namespace(mode='pep', pep_source=pep_source),
+    )
+    assert got == PEP_RESULT, (
+        'Статусы PEP из API должны совпадать со статусами на страницах'
+    )
+    fetched = [request.url for request in pep_mocker.request_history]
+    assert fetched == [PEP_INDEX_URL, PEP_API_URL], (
+        'При загрузке статусов из API страницы PEP не загружаются'
+    )
+
+
+def test_pep_auto_source_falls_back_to_pages(tempfile_session, pep_mocker):
+    pep_mocker.get(PEP_API_URL, status_code=503)
+    got = main.pep(
+        tempfile_session, Namespace(mode='pep', pep_source='auto'),
+    )
+    assert got == PEP_RESULT, (
+        'При недоступности API статусы загружаются со страниц PEP'
+    )
+    with pytest.raises(requests.HTTPError):
+        main.pep(tempfile_session, Namespace(mode='pep', pep_source='api'))
+
+
+def test_pep_api_verify_sample(tempfile_session, pep_mocker, caplog):
+    register_pep_api(pep_mocker)
+    pep_mocker.get(
+        PEP_INDEX_URL + 'pep-0750/',
+        text=PEP_PAGE.format(number=750, status='Withdrawn'),
+    )
+    got = main.pep(
+        tempfile_session,
+        Namespace(mode='pep', pep_source='api', verify_sample=4),
+    )
+    assert ('Withdrawn', 1) in got, (
+        'При расхождении со страницей PEP используется статус со страницы'
+    )
+    assert 'Статус PEP в API не совпадает со страницей' in caplog.text
+
+
+@pytest.mark.parametrize('mode, pep_source', [
+    ('pep', 'html'), ('pep-metadata', None),
+])
+def test_pep_progress_bar_completes(
+        monkeypatch, tempfile_session, pep_mocker, mode, pep_source
+):
+    import tqdm
+
+    bars = []
+
+    class RecordingTqdm(tqdm.tqdm):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, disable=True, **kwargs)
+            bars.append(self)
+
+        def __iter__(self):
+            for item in self.iterable:
+                yield item
+                self.n += 1
+
+    monkeypatch.setattr(tqdm, 'tqdm', RecordingTqdm)
+    main.MODE_TO_FUNCTION[mode](
+        tempfile_session,
+        Namespace(mode=mode, workers=2, pep_source=pep_source,
+                  checkpoint=False),
+    )
+    assert [(bar.n, bar.total) for bar in bars] == [(4, 4)], (
+        'Режим должен показывать одну полосу прогресса до конца'
+    )
+
+
+def test_several_streamed_modes_collect_rows_before_output(
+        monkeypatch, tmp_path, pep_mocker
+):
+    register_whats_new_pages(pep_mocker)
+    import caches
+    import checkpoints
+    import configs
+    import snapshots
+    for module in (caches, checkpoints, configs, snapshots):
+        monkeypatch.setattr(module, 'BASE_DIR', tmp_path)
+    outputs = []
+    monkeypatch.setattr(
+        main, 'control_output',
+        lambda results, cli_args: outputs.append(type(results)),
+    )
+    monkeypatch.setattr('sys.argv', [
+        'main.py', 'pep', 'whats-new', '-s', '--no-result-cache',
+    ])
+    main.main()
+    assert outputs == [list, list], (
+        'Строки нескольких режимов должны собираться вне блокировки вывода'
+    )
@@ -3,6 +3,7 @@ from typing import Optional
 from pathlib import Path
 import pytest
 from argparse import Namespace
+import json
 try:
     from src import outputs
 except ModuleNotFoundError:
@@ -90,3 +91,46 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_file_output_keeps_streamed_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+
+    def rows():
+        yield 'Статус', 'Количество'
+        yield 'Active', 1
+        raise RuntimeError('Парсер упал')
+
+    with pytest.raises(RuntimeError):
+        outputs.control_output(rows(), cli_args('pep', 'file'))
+    output_file, = (Path(tmp_path) / 'results').glob('*.csv')
+    assert output_file.read_text(encoding='utf-8').splitlines() == [
+        '"Статус","Количество"',
+        '"Active","1"',
+    ], 'Строки результата должны записываться в файл по мере готовности'
+
+
+def test_jsonl_output(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    header, *rows = records('pep')
+
+    outputs.control_output(records('pep'), cli_args('pep', 'jsonl'))
+    output_file, = (Path(tmp_path) / 'results').glob('pep_*.jsonl')
+    lines = output_file.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [
+        dict(zip(header, row)) for row in rows
+    ], 'Каждая строка JSON Lines должна быть объектом с полями из заголовка'
+
+
+def test_parquet_output(monkeypatch, tmp_path):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    rows = [('Статус', 'Количество'), ('Active', 33), ('Total', 33)]
+
+    outputs.control_output(rows, cli_args('pep', 'parquet'))
+    output_file, = (Path(tmp_path) / 'results').glob('pep_*.parquet')
+    table = parquet.read_table(output_file)
+    assert table.to_pylist() == [dict(zip(rows[0], row)) for row in rows[1:]]
+    assert str(table.schema.field('Количество').type) == 'int64', (
+        'Числовые столбцы должны сохраняться с числовым типом'
+    )
@@ -0,0 +1,33 @@
+from argparse import Namespace
+
+try:
+    from src import main
+    from profiling import profiler
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+
+
+def test_profiler_summary(
+        monkeypatch, tempfile_session, pep_mocker, caplog
+):
+    monkeypatch.setattr(profiler, 'enabled', True)
+    monkeypatch.setattr(profiler, '_records', type(profiler._records)(
+        profiler._records.default_factory
+    ))
+    main.pep(tempfile_session, Namespace(mode='pep', workers=2))
+    main.pep(tempfile_session, Namespace(mode='pep', workers=2))
+
+    summary = profiler.summary()
+    assert summary['urls'] == 5
+    assert summary['requests'] == 10
+    assert isinstance(summary['requests'], int), (
+        'Счётчики профиля должны быть целыми числами'
+    )
+    assert summary['cache_hit_ratio'] == 0.5, (
+        'Повторный запуск должен брать все страницы из кеша'
+    )
+    assert set(summary['stages']) == {'network', 'parse', 'extract'}
+    assert len(summary['slowest']) == 5
+    caplog.set_level('INFO')
+    profiler.log_summary()
+    assert 'запросов 10,' in caplog.text
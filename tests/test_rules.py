@@ -0,0 +1,60 @@
+import pytest
+import requests_mock
+
+from conftest import MAIN_DOC_URL
+
+try:
+    from src import main
+    import rules
+    import utils
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `rules.py`'
+
+SIDEBAR_PAGE = '''
+<div class="sphinxsidebarwrapper">
+<ul><li><a href="https://docs.python.org/3/">Home</a></li></ul>
+<ul><li>All versions</li>
+<li><a href="https://docs.python.org/3.14/">Python 3.14 (in development)</a></li>
+<li><a href="https://docs.python.org/3.13/">Python 3.13 (stable)</a></li>
+<li><a href="https://www.python.org/doc/versions/">All versions</a></li>
+</ul>
+</div>
+'''
+DOWNLOAD_PAGE = '''
+<a href="archives/python-3.13-docs-pdf-letter.zip">PDF (US)</a>
+<a href="archives/python-3.13-docs-pdf-a4.zip">PDF (A4)</a>
+'''
+
+
+def test_select_collects_all_targets_in_one_pass():
+    soup = utils.make_soup(
+        '<dl class="rfc2822 field-list simple"><dt>A:</dt><dd>1</dd>'
+        '<dt>B:</dt><dd>2</dd></dl><dl class="other"><dt>C:</dt></dl>'
+    )
+    header = rules.select(soup, 'pep').require('header')
+    assert [tag.text for tag in header['fields']] == ['A:', '1', 'B:', '2'], (
+        'Правила должны находить теги только внутри найденной группы'
+    )
+
+
+def test_select_require_raises():
+    soup = utils.make_soup('<p>Пусто</p>')
+    with pytest.raises(Exception) as excinfo:
+        rules.select(soup, 'download').require('archive')
+    assert excinfo.typename == 'ParserFindTagException'
+
+
+def test_latest_versions_and_download_links(tempfile_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL, text=SIDEBAR_PAGE)
+        got = main.latest_versions(tempfile_session)
+    assert got == [
+        ('Ссылка на документацию', 'Версия', 'Статус'),
+        ('https://docs.python.org/3.14/', '3.14', 'in development'),
+        ('https://docs.python.org/3.13/', '3.13', 'stable'),
+        ('https://www.python.org/doc/versions/', 'All versions', ''),
+    ], 'Проверьте разбор списка версий из боковой панели'
+
+    soup = utils.make_soup(DOWNLOAD_PAGE, 'download')
+    archive = rules.select(soup, 'download').require('archive')
+    assert archive['href'].endswith('pdf-a4.zip')
@@ -0,0 +1,46 @@
+from argparse import Namespace
+
+from conftest import PEP_INDEX_PAGE, PEP_INDEX_URL, register_pep_api
+
+try:
+    from src import main
+    import snapshots
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshots.py`'
+
+
+def test_incremental_pep_fetches_only_changed(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(snapshots, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', workers=2, incremental=True)
+    first = main.pep(tempfile_session, cli_args)
+
+    pep_mocker.reset_mock()
+    tempfile_session.cache.clear()
+    pep_mocker.get(
+        PEP_INDEX_URL,
+        text=PEP_INDEX_PAGE.replace('<abbr>S</abbr>', '<abbr>SF</abbr>'),
+    )
+    second = main.pep(tempfile_session, cli_args)
+
+    fetched = [request.url for request in pep_mocker.request_history]
+    assert fetched == [PEP_INDEX_URL, PEP_INDEX_URL + 'pep-0750/'], (
+        'В инкрементальном режиме должны загружаться только '
+        'новые и изменившиеся PEP'
+    )
+    assert second == first
+
+
+def test_incremental_pep_ignores_auto_api_source(
+        monkeypatch, tmp_path, tempfile_session, pep_mocker
+):
+    monkeypatch.setattr(snapshots, 'BASE_DIR', tmp_path)
+    register_pep_api(pep_mocker)
+    main.pep(
+        tempfile_session,
+        Namespace(mode='pep', workers=2, incremental=True, pep_source='auto'),
+    )
+    assert len(snapshots.open_pep_snapshot().load()) == 4, (
+        'Флаг `-i` должен обновлять снимок и при источнике статусов auto'
+    )
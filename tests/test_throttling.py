@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import throttling
+except (ModuleNotFoundError, ImportError):
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+
+
+def test_token_bucket_limits_rate():
+    limiter = throttling.HostLimiter(rate=50, max_in_flight=100)
+    started = time.monotonic()
+    for _ in range(60):
+        limiter.acquire()
+        limiter.release()
+    assert time.monotonic() - started >= 0.15, (
+        'Запросы сверх запаса корзины токенов должны ждать новых токенов'
+    )
+
+
+def test_in_flight_limit():
+    limiter = throttling.HostLimiter(max_in_flight=2)
+    observed = []
+
+    def request(_):
+        limiter.acquire()
+        observed.append(limiter.in_flight)
+        time.sleep(0.01)
+        limiter.release()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(request, range(16)))
+    assert max(observed) <= 2, (
+        'Число одновременных запросов к сайту не должно превышать лимит'
+    )
+
+
+def test_concurrency_adapts_to_errors_and_latency():
+    limiter = throttling.HostLimiter(max_in_flight=8)
+    limiter.acquire()
+    limiter.release(failed=True)
+    assert limiter.limit == 4, 'При ошибке лимит уменьшается вдвое'
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(elapsed=0.01)
+    assert limiter.limit == 8, (
+        'При быстрых ответах лимит возвращается к наибольшему значению'
+    )
+    limiter.acquire()
+    limiter.release(elapsed=1)
+    assert limiter.limit < 8, 'При росте задержки лимит уменьшается'
+
+
+def test_pause_blocks_acquire():
+    limiter = throttling.HostLimiter(max_in_flight=1)
+    limiter.pause(0.1)
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('3', 3),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0),
+    ('garbage', None),
+])
+def test_retry_after_seconds(value, expected):
+    response = requests.Response()
+    response.headers['Retry-After'] = value
+    assert throttling.retry_after_seconds(response) == expected
+
+
+def test_throttled_adapter_retries_with_retry_after(monkeypatch):
+    statuses = iter([429, 200])
+
+    def send(adapter, request, **kwargs):
+        response = requests.Response()
+        response.status_code = next(statuses)
+        response.raw = io.BytesIO()
+        response.headers['Retry-After'] = '0'
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, 'send', send)
+    adapter = throttling.ThrottledAdapter(
+        throttling.RateLimiter(max_in_flight=4), retries=2
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    assert session.get('https://peps.python.org/').status_code == 200, (
+        'Ответ 429 должен повторяться после паузы из Retry-After'
+    )
+    assert adapter.rate_limiter.host('peps.python.org').limit < 4, (
+        'После ответа 429 число одновременных запросов уменьшается'
+    )
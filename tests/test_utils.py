@@ -2,6 +2,7 @@ import pytest
 import requests
 import requests_mock
 import bs4
+import lxml.html
 from conftest import MAIN_DOC_URL
 try:
     from src import utils
@@ -54,3 +55,102 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+ARCHIVE = b'0123456789' * 1000
+
+
+def archive_body(request, context):
+    context.headers['ETag'] = '"v1"'
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range') == '"v1"':
+        start = int(range_header[len('bytes='):-1])
+        context.status_code = 206
+        return ARCHIVE[start:]
+    return ARCHIVE
+
+
+def test_download_file_resumes_and_skips(tmp_path, mock_session):
+    archive_path = tmp_path / 'python-docs-pdf-a4.zip'
+    (tmp_path / 'python-docs-pdf-a4.zip.part').write_bytes(ARCHIVE[:4000])
+    (tmp_path / 'python-docs-pdf-a4.zip.part.etag').write_text('"v1"')
+    with requests_mock.Mocker() as mock:
+        mock.head(ARCHIVE_URL, headers={'ETag': '"v1"'})
+        archive = mock.get(ARCHIVE_URL, content=archive_body)
+
+        assert utils.download_file(mock_session, ARCHIVE_URL, archive_path)
+        assert archive.last_request.headers['Range'] == 'bytes=4000-', (
+            'Прерванная загрузка должна продолжаться с места остановки'
+        )
+        assert archive_path.read_bytes() == ARCHIVE
+
+        assert not utils.download_file(
+            mock_session, ARCHIVE_URL, archive_path
+        ), 'Актуальный файл не должен загружаться повторно'
+        assert archive.call_count == 1
+
+
+PEP_HEADER_PAGE = '''
+<dl class="rfc2822 field-list simple">
+<dt class="field-odd">Author<span class="colon">:</span></dt>
+<dd class="field-odd">Guido van Rossum &lt;guido at python.org&gt;,
+Barry Warsaw</dd>
+<dt class="field-even">Status<span class="colon">:</span></dt>
+<dd class="field-even"><abbr title="Normative">Active</abbr></dd>
+<dt class="field-odd">Type<span class="colon">:</span></dt>
+<dd class="field-odd"><abbr title="Normative">Standards Track</abbr></dd>
+<dt class="field-even">Created<span class="colon">:</span></dt>
+<dd class="field-even">05-Jul-2001</dd>
+<dt class="field-odd">Replaces<span class="colon">:</span></dt>
+<dd class="field-odd"><a href="../pep-0003/">3</a></dd>
+</dl>
+'''
+
+
+@pytest.mark.parametrize('extractor, build_document', [
+    ('extract_pep_header', utils.make_soup),
+    ('extract_pep_header_xpath', lxml.html.fromstring),
+])
+def test_extract_pep_header(extractor, build_document):
+    got = getattr(utils, extractor)(build_document(PEP_HEADER_PAGE))
+    assert isinstance(got, utils.PepHeader), (
+        'Заголовок PEP должен возвращаться записью `PepHeader`'
+    )
+    assert got.author == 'Guido van Rossum <guido at python.org>, Barry Warsaw'
+    assert got.status == 'Active'
+    assert got.type == 'Standards Track', (
+        'Значения полей из нескольких слов должны сохраняться целиком'
+    )
+    assert got.created == '05-Jul-2001'
+    assert got.replaces == '3'
+    assert got.python_version is None, (
+        'Отсутствующие поля заголовка должны быть равны None'
+    )
+
+
+PEP_INDEX_ROWS_PAGE = '''
+<section id="numerical-index"><table><tbody>
+<tr><td><abbr title="Process, Active">PA</abbr></td>
+<td><a class="pep reference internal" href="../pep-0001/">1</a></td>
+<td><a class="pep reference internal" href="../pep-0001/">PEP Purpose
+and Guidelines</a></td><td>Warsaw, Hylton</td></tr>
+<tr><td><abbr title="Standards Track">S</abbr></td>
+<td><a href="../pep-0750/">750</a></td></tr>
+</tbody></table></section>
+'''
+
+
+def test_extract_pep_rows():
+    got = utils.extract_pep_rows(utils.make_soup(PEP_INDEX_ROWS_PAGE))
+    assert got == [
+        (1, 'A', 'PEP Purpose and Guidelines',
+         'https://peps.python.org/pep-0001/'),
+        (750, '', '', 'https://peps.python.org/pep-0750/'),
+    ], 'Строка индекса должна содержать номер, статус, название и ссылку'
+    assert all(isinstance(row, utils.PepIndexRow) for row in got), (
+        'Строки индекса PEP должны возвращаться записями `PepIndexRow`'
+    )
+    assert all(type(value) in (int, str) for row in got for value in row), (
+        'Строки индекса PEP не должны ссылаться на дерево документа'
+    )